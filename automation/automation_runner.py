@@ -1,55 +1,129 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 import pandas as pd
 import os
 
 from presets import PresetManager
+from utils import excel_writer, read_excel_fast
 
 
-def run_automation(input_file: str):
+class TkDispatcher:
     """
-    Called by watcher when a new Excel file appears
+    Runs callables on the Tk thread on behalf of worker threads.
+
+    Tk is not thread-safe, so the watcher keeps ONE hidden root on the main
+    thread and workers hand their dialogs over through a queue. call() blocks
+    the worker until the Tk thread has produced the result. close() fails every
+    call still waiting, so no worker is left blocked once the Tk loop is gone.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, root: tk.Tk):
+        self.root = root
+        self._requests: queue.Queue = queue.Queue()
+        self._thread = threading.current_thread()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.root.after(self.POLL_MS, self._drain)
+
+    def call(self, fn, *args, **kwargs):
+        if threading.current_thread() is self._thread:
+            return fn(*args, **kwargs)
+        reply: queue.Queue = queue.Queue(maxsize=1)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("UI is shutting down")
+            self._requests.put((fn, args, kwargs, reply))
+        ok, value = reply.get()
+        if not ok:
+            raise value
+        return value
+
+    def close(self):
+        """Refuse new calls and fail the queued ones (call on shutdown)."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                _, _, _, reply = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            reply.put((False, RuntimeError("UI is shutting down")))
+
+    def _drain(self):
+        while True:
+            try:
+                fn, args, kwargs, reply = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                reply.put((True, fn(*args, **kwargs)))
+            except Exception as e:
+                reply.put((False, e))
+        if not self._closed:
+            self.root.after(self.POLL_MS, self._drain)
+
+
+def run_automation(input_file: str, ui: TkDispatcher | None = None) -> bool:
     """
+    Called by watcher when a new Excel file appears.
 
-    root = tk.Tk()
-    root.withdraw()  # hide main window
+    ui: dispatcher owned by the watcher's Tk thread. When given, this runs on a
+    worker thread: dialogs go through ui.call(), file I/O stays on the worker.
+    Without it a private hidden root is created (standalone use).
+
+    Returns True once the output file is written, False when the user cancels.
+    """
+
+    if ui is None:
+        root = tk.Tk()
+        root.withdraw()  # hide main window
+        ui = TkDispatcher(root)
+    root = ui.root
 
     # 1️⃣ Ask for user IDs
-    user_input = simpledialog.askstring(
+    user_input = ui.call(
+        simpledialog.askstring,
         "User Selection",
-        "Enter User IDs (comma separated):\nExample: 2009-T44, 2010-A11"
+        "Enter User IDs (comma separated):\nExample: 2009-T44, 2010-A11",
+        parent=root,
     )
 
     if not user_input:
-        messagebox.showinfo("Cancelled", "No users entered. Skipping file.")
-        return
+        ui.call(messagebox.showinfo, "Cancelled", "No users entered. Skipping file.")
+        return False
 
     users = [u.strip() for u in user_input.split(",") if u.strip()]
     if not users:
-        messagebox.showerror("Error", "No valid User IDs entered.")
-        return
+        ui.call(messagebox.showerror, "Error", "No valid User IDs entered.")
+        return False
 
     # 2️⃣ Ask for preset
-    preset_name = PresetManager.prompt_select_preset(root)
+    preset_name = ui.call(PresetManager.prompt_select_preset, root)
     if not preset_name:
-        messagebox.showinfo("Cancelled", "No preset selected.")
-        return
+        ui.call(messagebox.showinfo, "Cancelled", "No preset selected.")
+        return False
 
     # 3️⃣ Load data
-    df = pd.read_excel(input_file)
+    if input_file.lower().endswith(".csv"):
+        df = pd.read_csv(input_file, dtype={"User": str})
+    else:
+        df = read_excel_fast(input_file, dtype={"User": str})
 
     # 4️⃣ Load preset config
     preset_cfg = PresetManager.load_preset_data(preset_name)
 
     output_path = os.path.splitext(input_file)[0] + "_OUTPUT.xlsx"
 
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
+    with excel_writer(output_path) as writer:
         for user in users:
-            df_user = df.copy()
-
-            # Apply preset filters
+            # apply_preset_to_df filters into new frames, so no per-user copy is needed.
+            # It is pure pandas, so it runs here on the worker, not the Tk thread.
             df_user = PresetManager.apply_preset_to_df(
-                df_user,
+                df,
                 preset_cfg,
                 extra_filters={
                     "User": user
@@ -62,7 +136,9 @@ def run_automation(input_file: str):
             sheet_name = user[:31]
             df_user.to_excel(writer, sheet_name=sheet_name, index=False)
 
-    messagebox.showinfo(
+    ui.call(
+        messagebox.showinfo,
         "Done",
         f"Output file created:\n{os.path.basename(output_path)}"
     )
+    return True
@@ -1,57 +1,215 @@
 # automation/watcher.py
-import time
+import hashlib
+import json
 import os
+import signal
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
-from automation.automation_runner import run_automation
+from automation.automation_runner import TkDispatcher, run_automation
 
 
 WATCH_EXTENSIONS = (".xlsx", ".xls", ".csv")
 
+# Seconds of quiet after the last event before a file is processed. A single
+# Excel save fires a burst of created/modified events; they collapse into one run.
+DEBOUNCE_SECONDS = 2.0
+
+# path -> file signature of the last processed version, kept across watcher restarts
+SEEN_PATH = os.path.join(os.path.expanduser("~"), ".excelops_seen.json")
+
+# Network filesystems where native change notifications are unreliable.
+NETWORK_FS_TYPES = {"cifs", "smbfs", "smb3", "nfs", "nfs4", "fuse.sshfs"}
+
+
+def _is_ignored(path: str) -> bool:
+    """Our own outputs, Office lock files and temp files never trigger a run."""
+    name = os.path.basename(path)
+    lower = name.lower()
+    return (
+        lower.endswith("_output.xlsx")
+        or name.startswith("~$")
+        or name.startswith(".~lock")
+        or lower.endswith(".tmp")
+    )
+
+
+def _file_signature(path: str) -> list | None:
+    """(mtime, size, hash of the first 64KB): cheap, and stable across duplicate events."""
+    try:
+        st = os.stat(path)
+        with open(path, "rb") as f:
+            head = hashlib.blake2b(f.read(64 * 1024), digest_size=16).hexdigest()
+    except OSError:
+        return None
+    return [st.st_mtime, st.st_size, head]
+
+
+def _load_seen(path: str) -> dict:
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_network_fs(folder_path: str) -> bool:
+    """Best-effort fstype lookup from /proc/mounts (Linux only)."""
+    try:
+        with open("/proc/mounts", "r") as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return False
+    best, fstype = "", ""
+    for parts in mounts:
+        if len(parts) < 3:
+            continue
+        mount_point = parts[1]
+        if folder_path.startswith(mount_point) and len(mount_point) > len(best):
+            best, fstype = mount_point, parts[2]
+    return fstype.lower() in NETWORK_FS_TYPES
+
 
 class ExcelFileHandler(FileSystemEventHandler):
+    def __init__(
+        self,
+        ui: TkDispatcher | None = None,
+        debounce_seconds: float = DEBOUNCE_SECONDS,
+        seen_path: str | None = SEEN_PATH,
+    ):
+        super().__init__()
+        self.ui = ui
+        self.debounce_seconds = debounce_seconds
+        # One worker: files are processed strictly one after another, never on
+        # the observer thread, so new events keep flowing during a long run.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excelops-automation")
+        self._timers: dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+        self.seen_path = seen_path
+        self._seen: dict[str, list] = _load_seen(seen_path) if seen_path else {}
+        # (path, signature) of versions queued or running; _seen only gets a
+        # version once its run has succeeded, so failed or cancelled ones retry
+        self._in_flight: set[tuple] = set()
+
     def on_created(self, event):
         self._handle(event, "CREATED")
 
     def on_modified(self, event):
         self._handle(event, "MODIFIED")
 
-    def _handle(self, event, event_type):
+    def on_closed(self, event):
+        self._handle(event, "CLOSED")
+
+    def on_moved(self, event):
+        # Excel and most editors save via a temp file renamed over the target.
         if event.is_directory:
             return
+        self._schedule(event.dest_path, "MOVED")
 
-        path = event.src_path
-        if path.lower().endswith(WATCH_EXTENSIONS):
-            print(f"[WATCHER] {event_type}: {os.path.basename(path)}")
-            run_automation(path)
-
+    def _handle(self, event, event_type):
+        if event.is_directory:
+            return
+        self._schedule(event.src_path, event_type)
 
-def start_watching(folder_path: str):
+    def _schedule(self, path, event_type):
+        if not path.lower().endswith(WATCH_EXTENSIONS) or _is_ignored(path):
+            return
+        with self._lock:
+            timer = self._timers.pop(path, None)
+            if timer is not None:
+                timer.cancel()
+            timer = threading.Timer(self.debounce_seconds, self._fire, args=(path, event_type))
+            timer.daemon = True
+            self._timers[path] = timer
+            timer.start()
+
+    def _fire(self, path, event_type):
+        with self._lock:
+            self._timers.pop(path, None)
+        sig = _file_signature(path)
+        if sig is None:
+            return
+        key = os.path.abspath(path)
+        job = (key, tuple(sig))
+        with self._lock:
+            if self._seen.get(key) == sig or job in self._in_flight:
+                # duplicate/echo event for a version already processed or queued
+                return
+            self._in_flight.add(job)
+        print(f"[WATCHER] {event_type}: {os.path.basename(path)}")
+        self.executor.submit(self._run, path, job)
+
+    def _save_seen(self):
+        if not self.seen_path:
+            return
+        try:
+            with open(self.seen_path, "w") as f:
+                json.dump(self._seen, f)
+        except OSError as e:
+            print(f"[WATCHER] Could not save seen-file cache: {e}")
+
+    def _run(self, path, job):
+        key, sig = job
+        try:
+            done = run_automation(path, ui=self.ui)
+        except Exception as e:
+            print(f"[WATCHER] FAILED: {os.path.basename(path)}: {e}")
+            done = False
+        with self._lock:
+            self._in_flight.discard(job)
+            if done:
+                self._seen[key] = list(sig)
+                self._save_seen()
+
+
+def start_watching(folder_path: str, use_polling: bool | None = None):
+    """
+    use_polling: force PollingObserver (True) or native notifications (False).
+    None auto-detects network mounts (CIFS/NFS), where native events are unreliable.
+    """
     folder_path = os.path.abspath(folder_path)
 
     if not os.path.exists(folder_path):
         os.makedirs(folder_path)
 
+    if use_polling is None:
+        use_polling = _is_network_fs(folder_path)
+
     print("=" * 50)
     print("[WATCHER] STARTED")
     print("[WATCHER] Folder:", folder_path)
+    print("[WATCHER] Mode:", "polling" if use_polling else "native")
     print("Drop Excel files into this folder")
     print("Press Ctrl+C to stop")
     print("=" * 50)
 
-    event_handler = ExcelFileHandler()
-    observer = Observer()
+    # Single hidden Tk root on the main thread; automation dialogs are routed to it.
+    root = tk.Tk()
+    root.withdraw()
+    ui = TkDispatcher(root)
+
+    event_handler = ExcelFileHandler(ui)
+    observer = PollingObserver(timeout=30) if use_polling else Observer()
     observer.schedule(event_handler, folder_path, recursive=False)
     observer.start()
 
+    # Tk swallows KeyboardInterrupt inside callbacks; quit the loop from a handler instead.
+    signal.signal(signal.SIGINT, lambda *_: root.quit())
     try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
+        root.mainloop()
+    finally:
         print("\n[WATCHER] STOPPED")
         observer.stop()
-
-    observer.join()
+        # a worker waiting on a dialog reply would never get one now; fail it so
+        # its (non-daemon) thread can finish and the process can exit
+        ui.close()
+        event_handler.executor.shutdown(wait=False, cancel_futures=True)
+        observer.join()
+        root.destroy()
 
 
 if __name__ == "__main__":
@@ -19,6 +19,122 @@ CALC_FUNCTIONS = [
 ]
 
 
+def _series_or_number(df: pd.DataFrame, token: str):
+    raw = token.strip()
+    if raw.startswith("`") and raw.endswith("`"):
+        col_name = raw[1:-1]
+        if col_name in df.columns:
+            return df[col_name]
+    if raw in df.columns:
+        return df[raw]
+    return pd.to_numeric(pd.Series([raw] * len(df)), errors="coerce")
+
+
+def _evaluate_formula_expr(df: pd.DataFrame, expr: str):
+    expr = expr.strip()
+    if "(" not in expr or not expr.endswith(")"):
+        return df.eval(expr, engine="python")
+
+    fn = expr.split("(", 1)[0].strip().upper()
+    args_raw = expr.split("(", 1)[1][:-1]
+    args = [a.strip() for a in args_raw.split(",") if a.strip()]
+    if fn not in CALC_FUNCTIONS:
+        return df.eval(expr, engine="python")
+
+    if fn == "ADD" and len(args) == 2:
+        return _series_or_number(df, args[0]) + _series_or_number(df, args[1])
+    if fn == "SUBTRACT" and len(args) == 2:
+        return _series_or_number(df, args[0]) - _series_or_number(df, args[1])
+    if fn == "MULTIPLY" and len(args) == 2:
+        return _series_or_number(df, args[0]) * _series_or_number(df, args[1])
+    if fn == "DIVIDE" and len(args) == 2:
+        b = _series_or_number(df, args[1]).replace(0, pd.NA)
+        return _series_or_number(df, args[0]) / b
+    if fn == "PERCENT" and len(args) == 2:
+        b = _series_or_number(df, args[1]).replace(0, pd.NA)
+        return (_series_or_number(df, args[0]) / b) * 100
+    if fn == "ABS" and len(args) == 1:
+        return _series_or_number(df, args[0]).abs()
+    if fn == "ROUND" and len(args) >= 1:
+        n = 0
+        if len(args) > 1:
+            try:
+                n = int(float(args[1]))
+            except Exception:
+                n = 0
+        return _series_or_number(df, args[0]).round(n)
+    if fn == "MIN" and len(args) == 2:
+        a = _series_or_number(df, args[0])
+        b = _series_or_number(df, args[1])
+        return pd.concat([a, b], axis=1).min(axis=1)
+    if fn == "MAX" and len(args) == 2:
+        a = _series_or_number(df, args[0])
+        b = _series_or_number(df, args[1])
+        return pd.concat([a, b], axis=1).max(axis=1)
+    if fn == "COALESCE" and len(args) == 2:
+        a = _series_or_number(df, args[0])
+        b = _series_or_number(df, args[1])
+        return a.fillna(b)
+
+    return df.eval(expr, engine="python")
+
+
+def _apply_column_edits(df: pd.DataFrame, formulas, dedupe_col, column_order, column_visible) -> pd.DataFrame:
+    """Formulas, then dedupe on dedupe_col (None: off), then column order/visibility. Never mutates df."""
+    if df is None or df.empty:
+        return df
+
+    copied = False
+    for f in formulas:
+        name = f.get("name", "").strip()
+        expr = f.get("expr", "").strip()
+        if not name or not expr:
+            continue
+        try:
+            values = _evaluate_formula_expr(df, expr)
+        except Exception:
+            continue
+        if not copied:
+            # callers may pass their source frame itself: never add columns to it
+            df = df.copy(deep=False)
+            copied = True
+        df[name] = values
+
+    if dedupe_col and dedupe_col in df.columns:
+        df = df.drop_duplicates(subset=[dedupe_col], keep="first")
+
+    df_cols = frozenset(df.columns)
+    hidden = frozenset(c for c, v in column_visible.items() if not v)
+    visible_cols = [c for c in column_order if c in df_cols and c not in hidden]
+    if visible_cols and visible_cols != list(df.columns):
+        df = df[visible_cols]
+    return df
+
+
+def apply_columns_config(df: pd.DataFrame, cfg: Dict[str, Any]) -> pd.DataFrame:
+    """Apply a ColumnsManagerFrame.get_config() dict to df without building any widgets."""
+    if df is None or df.empty:
+        return df
+    # the state load_config() gives a frame created on df (cfg itself is left untouched)
+    column_order = list(cfg.get("order", list(df.columns)))
+    column_visible = dict(cfg.get("visible", {c: True for c in df.columns}))
+    formulas = [
+        {"name": f.get("name", ""), "expr": f.get("expr", "")}
+        for f in cfg.get("formulas", [])
+        if isinstance(f, dict)
+    ]
+    known = set(column_order)
+    for f in formulas:
+        n = f["name"]
+        if n and n not in known:
+            known.add(n)
+            column_order.append(n)
+            column_visible[n] = True
+    dedupe = cfg.get("dedupe", {})
+    dedupe_col = dedupe.get("column", "") if dedupe.get("enabled", False) else None
+    return _apply_column_edits(df, formulas, dedupe_col, column_order, column_visible)
+
+
 class ColumnsManagerFrame(ttk.Frame):
     """
     Columns Manager:
@@ -200,65 +316,6 @@ class ColumnsManagerFrame(ttk.Frame):
             self.remove_duplicates_var.set(True)
         self._changed()
 
-    @staticmethod
-    def _series_or_number(df: pd.DataFrame, token: str):
-        raw = token.strip()
-        if raw.startswith("`") and raw.endswith("`"):
-            col_name = raw[1:-1]
-            if col_name in df.columns:
-                return df[col_name]
-        if raw in df.columns:
-            return df[raw]
-        return pd.to_numeric(pd.Series([raw] * len(df)), errors="coerce")
-
-    def _evaluate_formula_expr(self, df: pd.DataFrame, expr: str):
-        expr = expr.strip()
-        if "(" not in expr or not expr.endswith(")"):
-            return df.eval(expr, engine="python")
-
-        fn = expr.split("(", 1)[0].strip().upper()
-        args_raw = expr.split("(", 1)[1][:-1]
-        args = [a.strip() for a in args_raw.split(",") if a.strip()]
-        if fn not in CALC_FUNCTIONS:
-            return df.eval(expr, engine="python")
-
-        if fn == "ADD" and len(args) == 2:
-            return self._series_or_number(df, args[0]) + self._series_or_number(df, args[1])
-        if fn == "SUBTRACT" and len(args) == 2:
-            return self._series_or_number(df, args[0]) - self._series_or_number(df, args[1])
-        if fn == "MULTIPLY" and len(args) == 2:
-            return self._series_or_number(df, args[0]) * self._series_or_number(df, args[1])
-        if fn == "DIVIDE" and len(args) == 2:
-            b = self._series_or_number(df, args[1]).replace(0, pd.NA)
-            return self._series_or_number(df, args[0]) / b
-        if fn == "PERCENT" and len(args) == 2:
-            b = self._series_or_number(df, args[1]).replace(0, pd.NA)
-            return (self._series_or_number(df, args[0]) / b) * 100
-        if fn == "ABS" and len(args) == 1:
-            return self._series_or_number(df, args[0]).abs()
-        if fn == "ROUND" and len(args) >= 1:
-            n = 0
-            if len(args) > 1:
-                try:
-                    n = int(float(args[1]))
-                except Exception:
-                    n = 0
-            return self._series_or_number(df, args[0]).round(n)
-        if fn == "MIN" and len(args) == 2:
-            a = self._series_or_number(df, args[0])
-            b = self._series_or_number(df, args[1])
-            return pd.concat([a, b], axis=1).min(axis=1)
-        if fn == "MAX" and len(args) == 2:
-            a = self._series_or_number(df, args[0])
-            b = self._series_or_number(df, args[1])
-            return pd.concat([a, b], axis=1).max(axis=1)
-        if fn == "COALESCE" and len(args) == 2:
-            a = self._series_or_number(df, args[0])
-            b = self._series_or_number(df, args[1])
-            return a.fillna(b)
-
-        return df.eval(expr, engine="python")
-
     # ------------------------------------------------------------------
     # Column actions
     # ------------------------------------------------------------------
@@ -388,28 +445,8 @@ class ColumnsManagerFrame(ttk.Frame):
     # Core logic used by main.py
     # ------------------------------------------------------------------
     def apply_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        if df is None or df.empty:
-            return df
-
-        for f in self.formulas:
-            name = f.get("name", "").strip()
-            expr = f.get("expr", "").strip()
-            if not name or not expr:
-                continue
-            try:
-                df[name] = self._evaluate_formula_expr(df, expr)
-            except Exception:
-                continue
-
-        if self.remove_duplicates_var.get():
-            col = self.duplicate_column_var.get()
-            if col and col in df.columns:
-                df = df.drop_duplicates(subset=[col], keep="first")
-
-        visible_cols = [c for c in self.column_order if self.column_visible.get(c, True) and c in df.columns]
-        if visible_cols:
-            df = df[visible_cols]
-        return df
+        dedupe_col = self.duplicate_column_var.get() if self.remove_duplicates_var.get() else None
+        return _apply_column_edits(df, self.formulas, dedupe_col, self.column_order, self.column_visible)
 
     # ------------------------------------------------------------------
     # Presets
@@ -441,9 +478,11 @@ class ColumnsManagerFrame(ttk.Frame):
         self.remove_duplicates_var.set(dedupe.get("enabled", False))
         self.duplicate_column_var.set(dedupe.get("column", ""))
 
+        known = set(self.column_order)
         for f in self.formulas:
             n = f.get("name", "")
-            if n and n not in self.column_order:
+            if n and n not in known:
+                known.add(n)
                 self.column_order.append(n)
                 self.column_visible[n] = True
 
@@ -480,8 +519,10 @@ class ColumnsManagerFrame(ttk.Frame):
         current_cols = list(df.columns)
         formula_cols = [f.get("name", "") for f in self.formulas if f.get("name", "")]
 
+        known = set(self.column_order)
         for c in current_cols:
-            if c not in self.column_order:
+            if c not in known:
+                known.add(c)
                 self.column_order.append(c)
                 self.column_visible[c] = True
 
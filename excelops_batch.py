@@ -10,34 +10,67 @@ Usage:
 """
 
 import json
+import operator
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from utils import read_excel_fast, write_frames_streaming
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
 DEFAULT_UPLOAD = "/mnt/data/Activity Log_30.09.2025.xlsx"
 
+
+def _contains(a: pd.Series, b) -> pd.Series:
+    """Case-insensitive literal substring match."""
+    return a.astype(str).str.contains(re.escape(str(b)), case=False, regex=True, na=False)
+
+
 # Allowed operators
 OPS = {
-    "==": lambda a, b: a == b,
-    "!=": lambda a, b: a != b,
-    ">": lambda a, b: a > b,
-    "<": lambda a, b: a < b,
-    ">=": lambda a, b: a >= b,
-    "<=": lambda a, b: a <= b,
-    "contains": lambda a, b: a.astype(str).str.contains(str(b), case=False, na=False),
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "contains": _contains,
 }
 
 ACTIVITY_MATCH_SET = {"trade cnfm", "cxnc cnfm", "modf confirmation"}  # case-insensitive matching by substring
+ACTIVITY_RE = re.compile("|".join(re.escape(t) for t in sorted(ACTIVITY_MATCH_SET)), re.IGNORECASE)
+
+# Columns always treated as text; an explicit dtype skips pandas' type inference for them.
+STRING_DTYPES = {"USER": str, "Activity": str}
 
 
 def clean_numeric_series(series: pd.Series) -> pd.Series:
     """Strip % and commas and coerce to numeric. Non-convertible become NaN."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        # already numeric (the common case for Excel input): no string round-trip
+        return series
     s = series.astype(str).str.strip()
-    s = s.str.replace("%", "", regex=False).str.replace(",", "", regex=False)
-    s = s.replace({"": None})
-    return pd.to_numeric(s, errors="coerce")
+    out = pd.to_numeric(s, errors="coerce")
+    # only cells that failed AND carry a % or , need the (allocating) replace pass
+    retry = out.isna() & s.str.contains(r"[%,]", regex=True, na=False)
+    if retry.any():
+        out = out.astype(float)
+        out[retry] = pd.to_numeric(s[retry].str.replace(r"[%,]", "", regex=True), errors="coerce")
+    return out
 
 
 def choose(prompt: str, default: str | None = None) -> str:
@@ -50,18 +83,19 @@ def load_excel(path: str) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
     if path.suffix.lower() == ".csv":
-        df = pd.read_csv(path)
+        df = pd.read_csv(path, dtype=STRING_DTYPES)
     else:
-        df = pd.read_excel(path)
+        df = read_excel_fast(path, dtype=STRING_DTYPES)
     return df
 
 
 def list_unique_values(df: pd.DataFrame, col: str):
     if col not in df.columns:
         return []
-    vals = df[col].dropna().astype(str).unique().tolist()
-    vals_sorted = sorted(vals, key=lambda x: str(x).lower())
-    return vals_sorted
+    vals = pd.Series(df[col].dropna().astype(str).unique())
+    # case-insensitive order via one vectorized lower() + stable argsort
+    order = vals.str.lower().argsort(kind="stable").to_numpy()
+    return vals.iloc[order].tolist()
 
 
 def prompt_choose_users(df: pd.DataFrame, user_col: str = "USER"):
@@ -109,6 +143,24 @@ def prompt_choose_users(df: pd.DataFrame, user_col: str = "USER"):
     return out
 
 
+# path -> (st_mtime_ns, parsed config); repeated runs against an unchanged file skip the parse
+_CFG_CACHE: dict[str, tuple[int, dict]] = {}
+
+
+def load_json_config(path) -> dict:
+    """Parse a JSON config, reusing the previous result while the file's mtime is unchanged."""
+    p = Path(path)
+    key = str(p.resolve())
+    mtime = p.stat().st_mtime_ns
+    cached = _CFG_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    raw = p.read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+    _CFG_CACHE[key] = (mtime, data)
+    return data
+
+
 def prompt_json_config() -> (dict, str):
     """
     Prompt user to pick or create a JSON config file.
@@ -129,7 +181,7 @@ def prompt_json_config() -> (dict, str):
         p = Path(path)
         if p.exists():
             try:
-                data = json.loads(p.read_text(encoding="utf-8"))
+                data = load_json_config(p)
                 print(f"Loaded config from {p}")
                 return data, str(p)
             except Exception as e:
@@ -205,6 +257,22 @@ def apply_config_filters(df: pd.DataFrame, filters: list, logic: str = "AND", ba
     if base_df is None:
         base_df = df
 
+    # Several filters often hit the same numeric column; clean each one only once.
+    num_cache: dict[tuple[int, str], pd.Series] = {}
+
+    def _num(frame: pd.DataFrame, c: str) -> pd.Series:
+        key = (id(frame), c)
+        if key not in num_cache:
+            num_cache[key] = clean_numeric_series(frame[c])
+        return num_cache[key]
+
+    str_cache: dict[str, pd.Series] = {}
+
+    def _str(c: str) -> pd.Series:
+        if c not in str_cache:
+            str_cache[c] = df[c].astype(str)
+        return str_cache[c]
+
     masks = []
     for f in filters:
         col = f.get("col")
@@ -216,24 +284,23 @@ def apply_config_filters(df: pd.DataFrame, filters: list, logic: str = "AND", ba
             # skip invalid
             continue
         try:
-            s_raw = df[col]
             if val_type == "column_average":
                 # compute avg from base_df column (numeric)
                 if col not in base_df.columns:
-                    masks.append(pd.Series([False] * len(df), index=df.index))
+                    masks.append(pd.Series(False, index=df.index))
                     continue
-                avg = clean_numeric_series(base_df[col]).mean(skipna=True)
+                avg = _num(base_df, col).mean(skipna=True)
                 if pd.isna(avg):
-                    masks.append(pd.Series([False] * len(df), index=df.index))
+                    masks.append(pd.Series(False, index=df.index))
                 else:
-                    s_num = clean_numeric_series(s_raw)
+                    s_num = _num(df, col)
                     mask = OPS[op](s_num, avg)
                     masks.append(mask.fillna(False))
                 continue
 
             # value type
             if op == "contains":
-                mask = OPS[op](s_raw.astype(str), val)
+                mask = OPS[op](_str(col), val)
                 masks.append(mask.fillna(False))
                 continue
 
@@ -245,33 +312,40 @@ def apply_config_filters(df: pd.DataFrame, filters: list, logic: str = "AND", ba
                 vnum = None
 
             if vnum is not None:
-                s_num = clean_numeric_series(s_raw)
+                s_num = _num(df, col)
                 mask = OPS[op](s_num, vnum)
                 masks.append(mask.fillna(False))
             else:
                 # string equality/inequality
                 if op in ("==", "!="):
-                    mask = OPS[op](s_raw.astype(str), str(val))
+                    mask = OPS[op](_str(col), str(val))
                     masks.append(mask.fillna(False))
                 else:
                     # incompatible op on strings -> skip
-                    masks.append(pd.Series([False] * len(df), index=df.index))
+                    masks.append(pd.Series(False, index=df.index))
         except Exception as e:
-            masks.append(pd.Series([False] * len(df), index=df.index))
+            masks.append(pd.Series(False, index=df.index))
 
     if not masks:
         return df
+    stacked = [m.to_numpy(dtype=bool) for m in masks]
     if logic.upper() == "AND":
-        final = masks[0]
-        for m in masks[1:]:
-            final &= m
+        final = np.logical_and.reduce(stacked)
     else:
-        final = masks[0]
-        for m in masks[1:]:
-            final |= m
+        final = np.logical_or.reduce(stacked)
     return df[final]
 
 
+def _arrow_sort_order(df: pd.DataFrame, cols: list, asc: list) -> np.ndarray:
+    """
+    Row positions from Arrow's multi-key sort (typed C++ compares, no Python objects).
+    Arrow places nulls (and NaN) at the end by default, matching na_position="last".
+    """
+    tbl = pa.Table.from_pandas(df.loc[:, cols], preserve_index=False)
+    keys = [(c, "ascending" if a else "descending") for c, a in zip(cols, asc)]
+    return pc.sort_indices(tbl, sort_keys=keys).to_numpy()
+
+
 def apply_config_sorts(df: pd.DataFrame, sorts: list) -> pd.DataFrame:
     if df is None or df.empty or not sorts:
         return df
@@ -285,6 +359,12 @@ def apply_config_sorts(df: pd.DataFrame, sorts: list) -> pd.DataFrame:
         asc.append(bool(s.get("ascending", True)))
     if not cols:
         return df
+    if pc is not None:
+        try:
+            return df.take(_arrow_sort_order(df, cols, asc))
+        except Exception:
+            # mixed-type object columns etc. cannot go through Arrow; use pandas
+            pass
     try:
         return df.sort_values(by=cols, ascending=asc, na_position="last")
     except Exception:
@@ -303,22 +383,39 @@ def apply_config_columns(df: pd.DataFrame, columns_cfg: dict) -> pd.DataFrame:
         return df
     keep = columns_cfg.get("keep", [])
     reorder = columns_cfg.get("reorder", [])
+    # Resolve the final column list first, then slice the frame once.
+    cols = list(df.columns)
     if keep:
-        keep_preserve = [c for c in df.columns if c in keep]
-        df = df.loc[:, keep_preserve]
+        keep_set = set(keep)
+        cols = [c for c in cols if c in keep_set]
     if reorder:
         # only keep columns that exist now
-        newcols = [c for c in reorder if c in df.columns]
+        present = set(cols)
+        newcols = [c for c in reorder if c in present]
         if newcols:
-            df = df.loc[:, newcols]
-    return df
+            cols = newcols
+    if cols == list(df.columns):
+        return df
+    return df.loc[:, cols]
+
+
+# Excel forbids these characters in sheet names: : \ / ? * [ ]
+_SHEET_NAME_DELETE = str.maketrans("", "", "[]:*?/\\")
 
 
 def sanitize_sheet_name(name: str) -> str:
-    # Excel sheet name max length 31. Also remove forbidden chars: : \ / ? * [ ]
-    bad = set(r'[]:*?/\\')
-    s = "".join(ch for ch in name if ch not in bad)
-    return s[:31]
+    # Excel sheet name max length 31. Also remove forbidden chars.
+    return name.translate(_SHEET_NAME_DELETE)[:31]
+
+
+def _activity_mask(series: pd.Series) -> pd.Series:
+    """
+    Activity values come from a small vocabulary, so match the regex against the
+    unique values only and turn the per-row test into a hash lookup (isin).
+    """
+    text = series.astype(str)
+    matching = {v for v in text.unique() if isinstance(v, str) and ACTIVITY_RE.search(v)}
+    return text.isin(matching)
 
 
 def process_for_users(df: pd.DataFrame, users: list, config: dict, user_col: str = "USER", activity_col: str = "Activity"):
@@ -326,17 +423,31 @@ def process_for_users(df: pd.DataFrame, users: list, config: dict, user_col: str
     Returns dict: {user_name: dataframe}
     """
     out = {}
+    # Cast USER to str once and dictionary-encode it: selecting users is then an
+    # integer compare on category codes instead of a string compare per user.
+    user_cat = df[user_col].astype(str).astype("category")
+    cats = user_cat.cat.categories
+    codes = user_cat.cat.codes.to_numpy()
+    code_of = {str(u): cats.get_loc(str(u)) for u in users if str(u) in cats}
+    sel = np.isin(codes, list(code_of.values()))
+    sub_all = df[sel]
+    sub_codes = codes[sel]
+
+    # Activity filter: keep rows where activity contains any of the target strings (case-insensitive)
+    if activity_col in sub_all.columns:
+        act = _activity_mask(sub_all[activity_col]).to_numpy()
+    else:
+        act = np.zeros(len(sub_all), dtype=bool)
+    sub_all = sub_all[act]
+    groups = dict(iter(sub_all.groupby(sub_codes[act], sort=False)))
+
     for user in users:
-        sub = df[df[user_col].astype(str) == str(user)].copy()
-        if sub.empty:
+        code = code_of.get(str(user))
+        if code is None:
             print(f"[WARN] No rows for user {user}")
             out[user] = pd.DataFrame(columns=df.columns)
             continue
-
-        # Activity filter: keep rows where activity contains any of the target strings (case-insensitive)
-        act_series = sub[activity_col].astype(str).str.strip().str.lower() if activity_col in sub.columns else pd.Series([""] * len(sub), index=sub.index)
-        mask_act = act_series.apply(lambda v: any(tok in v for tok in ACTIVITY_MATCH_SET))
-        sub = sub[mask_act]
+        sub = groups.get(code, sub_all.iloc[0:0])
 
         # Apply config filters (common edits)
         sub = apply_config_filters(sub, config.get("filters", []), logic=config.get("filters_logic", "AND"), base_df=df)
@@ -355,10 +466,8 @@ def process_for_users(df: pd.DataFrame, users: list, config: dict, user_col: str
 def write_workbook(user_dfs: dict, dest_path: str):
     dest = Path(dest_path)
     try:
-        with pd.ExcelWriter(dest, engine="openpyxl") as writer:
-            for user, df in user_dfs.items():
-                sheet = sanitize_sheet_name(str(user))
-                df.to_excel(writer, sheet_name=sheet or "sheet", index=False)
+        frames = [(sanitize_sheet_name(str(user)) or "sheet", df) for user, df in user_dfs.items()]
+        write_frames_streaming(frames, dest)
         print(f"Saved workbook to {dest}")
     except Exception as e:
         print("Failed to save workbook:", e)
@@ -374,27 +483,33 @@ def main():
         print("No file provided. Exiting.")
         return
 
-    try:
-        df = load_excel(path)
-    except Exception as e:
-        print("Failed to load file:", e)
+    if not Path(path).exists():
+        print("Failed to load file:", f"File not found: {path}")
         return
 
+    # 2) pick or create JSON config while the workbook parses in the background;
+    #    the prompt does not need the data, so the slow XML parse hides behind it.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        load_future = pool.submit(load_excel, path)
+        config, cfg_path = prompt_json_config()
+        print("Using config:", cfg_path)
+        try:
+            df = load_future.result()
+        except Exception as e:
+            print("Failed to load file:", e)
+            return
+
     print(f"Loaded file with {len(df)} rows and {len(df.columns)} columns.")
     # show some columns for convenience
     print("Columns:", ", ".join(list(df.columns)[:50]))
 
-    # 2) select users
+    # 3) select users
     users = prompt_choose_users(df, user_col="USER")
     if not users:
         print("No users selected. Exiting.")
         return
     print("Selected users:", users)
 
-    # 3) pick or create JSON config
-    config, cfg_path = prompt_json_config()
-    print("Using config:", cfg_path)
-
     # 4) Process each user
     user_dfs = process_for_users(df, users, config, user_col="USER", activity_col="Activity")
 
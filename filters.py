@@ -1,9 +1,20 @@
 import tkinter as tk
 from tkinter import ttk
 import pandas as pd
+import numpy as np
+import math
 import operator
+import weakref
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 from typing import Optional, List, Dict, Any
 
+from utils import split_csv
+
+try:
+    import numexpr  # noqa: F401  (lets DataFrame.eval fuse all comparisons into one pass)
+except ImportError:
+    numexpr = None
+
 # ---------------- Operators ----------------
 OPS = {
     "==": operator.eq,
@@ -16,6 +27,8 @@ OPS = {
 
 COLUMN_OPS = ("== Column", "!= Column")
 
+_UNPARSED = object()  # row["num"] before the value box has been parsed
+
 # ---------------- Helpers ----------------
 def _clean_numeric_series(s: pd.Series) -> pd.Series:
     s2 = s.astype(str).str.strip()
@@ -23,7 +36,310 @@ def _clean_numeric_series(s: pd.Series) -> pd.Series:
     return pd.to_numeric(s2, errors="coerce")
 
 
-class FiltersFrame(ttk.Frame):
+def _uniq_first_n(s: pd.Series, n: int, chunk: int = 65536) -> List[str]:
+    """
+    First n distinct non-null values of s as str, in order of appearance. Scans
+    in chunks and stops once n are found instead of hashing the whole column.
+    """
+    seen: Dict[str, None] = {}
+    for start in range(0, len(s), chunk):
+        for v in s.iloc[start:start + chunk].dropna().unique():
+            seen.setdefault(str(v), None)
+            if len(seen) >= n:
+                return list(seen)
+    return list(seen)
+
+
+def _native_comparable(dtype) -> bool:
+    """numpy numeric/datetime dtypes or the NaN-backed str dtype: == gives plain bools."""
+    if isinstance(dtype, np.dtype):
+        return dtype.kind in "biufmM"
+    return isinstance(dtype, pd.StringDtype) and dtype.na_value is np.nan
+
+
+class FilterEngine:
+    """
+    The pandas side of the filters: derived column views, per-row predicates and
+    memoised results over (join, col, op, val, cmp, num) row tuples. Holds no Tk
+    state, so FiltersFrame runs it on a worker and presets/automation use it
+    headlessly through apply_filters_config().
+    """
+
+    RESULT_CACHE_SIZE = 8
+
+    def __init__(self):
+        # (id(df), col, kind) -> (weakref to df, derived column view), see _view()
+        self._view_cache: Dict[tuple, tuple] = {}
+        # (rows signature, compiled numexpr expression or None) of the last apply
+        self._compiled: Optional[tuple] = None
+        self._generation = 0  # bumped per fire; stale worker runs cancel themselves
+        # (id(df), rows snapshot) -> (weakref to df, selected row positions or None for all)
+        self._result_cache: Dict[tuple, tuple] = {}
+
+    def _view(self, df: pd.DataFrame, col, kind: str):
+        """
+        Derived view of df[col], built once and reused while the same DataFrame is
+        filtered again:
+          "num" - _clean_numeric_series result
+          "float" - the "num" view as a float64 ndarray (NaN for missing)
+          "str" - the column cast to str
+          "arr" - the "str" view as an ndarray, for positional indexing
+          "lower" - the "str" view lower-cased, for case-insensitive contains
+          "cat" - Categorical of the "str" view, or None if the column is not
+                  low-cardinality (less than half the values distinct)
+        """
+        key = (id(df), col, kind)
+        hit = self._view_cache.get(key)
+        if hit is not None and hit[0]() is df:
+            return hit[1]
+        if kind == "num":
+            s = df[col]
+            if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+                # already numeric: the str round-trip would only reproduce the values
+                v = s
+            else:
+                v = _clean_numeric_series(s)
+        elif kind == "float":
+            v = self._view(df, col, "num").to_numpy(dtype="float64", na_value=np.nan)
+        elif kind == "str":
+            v = df[col].astype(str)
+        elif kind == "arr":
+            v = self._view(df, col, "str").to_numpy()
+        elif kind == "lower":
+            v = self._view(df, col, "str").str.lower()
+        else:
+            cat = pd.Categorical(self._view(df, col, "str"))
+            v = cat if len(cat.categories) < 0.5 * len(cat) else None
+        # drop the entry when df is collected, so a recycled id() can never hit it
+        ref = weakref.ref(df, lambda _, k=key: self._view_cache.pop(k, None))
+        self._view_cache[key] = (ref, v)
+        return v
+
+    def _row_predicate(self, df: pd.DataFrame, col, op, val, cmp_col, num: Optional[float]):
+        """
+        Build pred(pos) -> bool ndarray for one filter row, evaluated only at the
+        given row positions. Column-wide inputs (Column Average, the cleaned
+        numeric column) are still computed over the whole column.
+        """
+        s = df[col]
+
+        if op in COLUMN_OPS and cmp_col in df.columns:
+            s2 = df[cmp_col]
+            negate = op.startswith("!=")
+
+            if s.dtype == s2.dtype and _native_comparable(s.dtype):
+                # same numeric/datetime/str dtype: compare natively, no string
+                # copies; two blanks count as equal. object columns keep the str
+                # comparison (1 matches "1", 1.0 does not match 1; pd.NA is safe).
+                def pred(pos):
+                    a, b = s.iloc[pos].to_numpy(), s2.iloc[pos].to_numpy()
+                    eq = (a == b) | (pd.isna(a) & pd.isna(b))
+                    return ~eq if negate else eq
+            else:
+                def pred(pos):
+                    eq = self._view(df, col, "arr")[pos] == self._view(df, cmp_col, "arr")[pos]
+                    return ~eq if negate else eq
+
+        elif op == "contains":
+            # literal substring (no regex compile, and a half-typed "(" can't raise),
+            # matched against the pre-lowered view so nothing is case-folded per call
+            needle = str(val).lower()
+
+            def pred(pos):
+                return self._view(df, col, "lower").iloc[pos].str.contains(needle, regex=False, na=False)
+
+        elif op == "in":
+            values = list(split_csv(str(val)))
+
+            def pred(pos):
+                cat = self._view(df, col, "cat")
+                if cat is not None:
+                    # compare small integer codes instead of Python strings
+                    wanted = cat.categories.get_indexer(values)
+                    return np.isin(cat.codes[pos], wanted[wanted >= 0])
+                return self._view(df, col, "str").iloc[pos].isin(values)
+
+        elif val.lower() == "column average":
+            fn = OPS[op]
+
+            def pred(pos):
+                return fn(self._view(df, col, "float")[pos], self._view(df, col, "num").mean())
+
+        else:
+            fn = OPS[op]
+            if num is not None:
+                def pred(pos):
+                    return fn(self._view(df, col, "float")[pos], num)
+            elif op in ("==", "!="):
+                def pred(pos):
+                    cat = self._view(df, col, "cat")
+                    if cat is not None:
+                        code = cat.categories.get_indexer([str(val)])[0]
+                        eq = cat.codes[pos] == code if code >= 0 else np.zeros(len(pos), dtype=bool)
+                        return ~eq if op == "!=" else eq
+                    return fn(self._view(df, col, "str").iloc[pos], str(val))
+            else:
+                def pred(pos):
+                    return fn(self._view(df, col, "str").iloc[pos], str(val))
+
+        def as_bool(pos):
+            m = pred(pos)
+            if isinstance(m, pd.Series):
+                if m.dtype == bool:
+                    # plain bool cannot hold NA: no fillna copy needed
+                    return m.to_numpy()
+                m = m.fillna(False)
+            return np.asarray(m, dtype=bool)
+
+        return as_bool
+
+    def _range_predicate(self, df: pd.DataFrame, col, tests: list):
+        """AND of [(op_fn, number), ...] on one column, from a single slice of its numeric view."""
+        def pred(pos):
+            n = self._view(df, col, "float")[pos]
+            return np.logical_and.reduce([fn(n, num) for fn, num in tests])
+        return pred
+
+    def _compile_expr(self, rows: tuple) -> Optional[tuple]:
+        """
+        Compile the rows to one numexpr expression, e.g. "((c0 > 1.5) & (c1 == 2.0)) | ((c0 < 0.0))",
+        returning (expr, [source column per c<i>]). None unless every active row is a
+        plain numeric comparison against a constant.
+        """
+        if self._compiled is not None and self._compiled[0] == rows:
+            return self._compiled[1]
+
+        compiled = None
+        names: Dict[Any, str] = {}
+        chains: List[List[str]] = []
+        for join, col, op, val, cmp_col, num in rows:
+            if op not in OPS or num is None or not math.isfinite(num):
+                break
+            name = names.setdefault(col, f"c{len(names)}")
+            term = f"({name} {op} {num!r})"
+            if not chains or join == "OR":
+                chains.append([term])
+            else:
+                chains[-1].append(term)
+        else:
+            if chains:
+                expr = " | ".join("(" + " & ".join(chain) + ")" for chain in chains)
+                compiled = (expr, list(names))
+
+        self._compiled = (rows, compiled)
+        return compiled
+
+    def _apply_rows(self, df: pd.DataFrame, rows: tuple, generation: Optional[int] = None) -> pd.DataFrame:
+        """
+        Filter df by a _snapshot_rows() snapshot. Touches no Tk state, so it can run
+        on the worker; when generation is given, gives up with CancelledError as
+        soon as a newer edit has superseded it.
+        """
+        def check():
+            if generation is not None and generation != self._generation:
+                raise CancelledError()
+
+        key = rows
+        rows = tuple(r for r in rows if r[1] and r[1] in df.columns)
+
+        compiled = self._compile_expr(rows) if numexpr is not None else None
+        if compiled is not None:
+            expr, cols = compiled
+            frame = pd.DataFrame(
+                {
+                    f"c{i}": self._view(df, col, "float")
+                    for i, col in enumerate(cols)
+                }
+            )
+            mask = frame.eval(expr, engine="numexpr")
+            positions = np.flatnonzero(np.asarray(mask, dtype=bool))
+
+        elif not rows:
+            positions = None
+
+        else:
+            # AND binds tighter than OR: rows split into AND-chains, each new OR starts a chain
+            # Consecutive "col <op> number" rows on the same column inside a chain
+            # (e.g. x > 3 AND x < 10) share one slice of the numeric view.
+            groups: List[list] = []
+            for join, col, op, val, cmp_col, num in rows:
+                if not groups or join == "OR":
+                    groups.append([])
+                chain = groups[-1]
+                if op in OPS and num is not None:
+                    if chain and isinstance(chain[-1], tuple) and chain[-1][0] == col:
+                        chain[-1][1].append((OPS[op], num))
+                    else:
+                        chain.append((col, [(OPS[op], num)]))
+                else:
+                    chain.append(self._row_predicate(df, col, op, val, cmp_col, num))
+            groups = [
+                [self._range_predicate(df, *p) if isinstance(p, tuple) else p for p in chain]
+                for chain in groups
+            ]
+
+            # Shrinking active set: a chain is only evaluated on rows no earlier chain
+            # selected, and each AND step only on the rows that survived the previous one.
+            selected = np.zeros(len(df), dtype=bool)
+            for chain in groups:
+                active = np.flatnonzero(~selected)
+                for pred in chain:
+                    check()
+                    if not len(active):
+                        break
+                    active = active[pred(active)]
+                selected[active] = True
+            positions = np.flatnonzero(selected)
+
+        check()
+        self._remember(df, key, positions)
+        return df if positions is None else df.iloc[positions]
+
+    def _remember(self, df: pd.DataFrame, rows: tuple, positions: Optional[np.ndarray]):
+        """Memoise the selected positions (not the filtered copy) for (df, rows)."""
+        key = (id(df), rows)
+        cache = self._result_cache
+        cache.pop(key, None)
+        while len(cache) >= self.RESULT_CACHE_SIZE:
+            cache.pop(next(iter(cache)), None)
+        # drop the entry when df is collected, so a recycled id() can never hit it
+        ref = weakref.ref(df, lambda _, k=key: cache.pop(k, None))
+        cache[key] = (ref, positions)
+
+
+def _parse_number(val: str) -> Optional[float]:
+    try:
+        return float(val)
+    except ValueError:
+        return None
+
+
+def _config_rows(cfg: Dict[str, Any]) -> tuple:
+    """get_config()/preset filters as row tuples, with the defaults and str values load_config's widgets give them."""
+    rows = []
+    for f in cfg.get("filters", []):
+        if isinstance(f, dict):
+            join, col, op, val, cmp_col = (
+                f.get("join", ""), f.get("col", ""), f.get("op", "=="), f.get("val", ""), f.get("cmp", "")
+            )
+        elif isinstance(f, (list, tuple)) and len(f) >= 4:
+            join, col, op, val = f[:4]
+            cmp_col = f[4] if len(f) > 4 else ""
+        else:
+            continue
+        join, col, op, val, cmp_col = (str(x) for x in (join, col, op, val, cmp_col))
+        rows.append((join, col, op, val, cmp_col, _parse_number(val)))
+    return tuple(rows)
+
+
+def apply_filters_config(df: pd.DataFrame, cfg: Dict[str, Any]) -> pd.DataFrame:
+    """Filter df by a FiltersFrame.get_config() dict without building any widgets."""
+    if df is None or df.empty:
+        return df
+    return FilterEngine()._apply_rows(df, _config_rows(cfg))
+
+
+class FiltersFrame(ttk.Frame, FilterEngine):
     """
     Multi-row filters with AND / OR per row
     Supports:
@@ -36,6 +352,13 @@ class FiltersFrame(ttk.Frame):
         self.on_change = on_change_callback
         self.df = df
         self.rows: List[Optional[Dict[str, Any]]] = []
+        # tkinter's widget __init__ does not chain to the next base: set up the engine's caches here
+        FilterEngine.__init__(self)
+        self._pending: Optional[str] = None  # after() id of the scheduled on_change
+        # Background filtering: _fire() computes the result on a worker, then calls
+        # on_change on the Tk thread, whose apply_filters() finds it in _result_cache.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._future: Optional[Future] = None
         self._build_ui()
 
     # ---------------- UI ----------------
@@ -122,6 +445,7 @@ class FiltersFrame(ttk.Frame):
             "cmp": cmp_col,
             "val_cb": val_cb,
             "cmp_cb": cmp_cb,
+            "num": _UNPARSED,
         }
         self.rows.append(row)
 
@@ -133,6 +457,7 @@ class FiltersFrame(ttk.Frame):
 
         for var in (join, col, op, val, cmp_col):
             var.trace_add("write", lambda *_: self._changed())
+        val.trace_add("write", lambda *_, r=row: r.__setitem__("num", _UNPARSED))
 
         if preset:
             join.set(preset.get("join", ""))
@@ -183,7 +508,7 @@ class FiltersFrame(ttk.Frame):
             return
         col = row["col"].get()
         if col in self.df.columns:
-            vals = self.df[col].dropna().astype(str).unique().tolist()[:300]
+            vals = _uniq_first_n(self.df[col], 300)
             row["val_cb"]["values"] = ["Column Average"] + vals
 
     def _on_column_changed(self, row):
@@ -191,69 +516,30 @@ class FiltersFrame(ttk.Frame):
         self._changed()
 
     # ---------------- Apply ----------------
+    @staticmethod
+    def _row_number(row) -> Optional[float]:
+        """float of the row's value box, parsed once per edit; None if it is not numeric."""
+        num = row["num"]
+        if num is _UNPARSED:
+            num = row["num"] = _parse_number(row["val"].get())
+        return num
+
+    def _snapshot_rows(self) -> tuple:
+        """(join, col, op, val, cmp, num) per row. Reads the Tk variables, so Tk thread only."""
+        return tuple(
+            (r["join"].get(), r["col"].get(), r["op"].get(), r["val"].get(), r["cmp"].get(), self._row_number(r))
+            for r in self.rows
+        )
+
     def apply_filters(self, df: pd.DataFrame) -> pd.DataFrame:
         if df is None or df.empty:
             return df
-
-        masks, joins = [], []
-
-        for r in self.rows:
-            col, op, val, cmp_col = r["col"].get(), r["op"].get(), r["val"].get(), r["cmp"].get()
-            if not col or col not in df.columns:
-                continue
-
-            s = df[col]
-
-            if op in COLUMN_OPS and cmp_col in df.columns:
-                s2 = df[cmp_col]
-                m = s.astype(str) != s2.astype(str) if op.startswith("!=") else s.astype(str) == s2.astype(str)
-
-            elif op == "contains":
-                m = s.astype(str).str.contains(str(val), case=False, na=False)
-
-            elif op == "in":
-                values = [v.strip() for v in str(val).split(",") if v.strip()]
-                m = s.astype(str).isin(values)
-
-            elif val.lower() == "column average":
-                avg = _clean_numeric_series(s).mean()
-                m = OPS[op](_clean_numeric_series(s), avg)
-
-            else:
-                try:
-                    m = OPS[op](_clean_numeric_series(s), float(val))
-                except Exception:
-                    m = OPS[op](s.astype(str), str(val))
-
-            if not isinstance(m, pd.Series):
-                continue
-
-            masks.append(m.fillna(False))
-            joins.append(r["join"].get())
-
-        if not masks:
-            return df
-
-        groups = []
-        current = None
-        for i, m in enumerate(masks):
-            join = joins[i] if i < len(joins) else ""
-            if current is None:
-                current = m
-                continue
-            if join == "OR":
-                groups.append(current)
-                current = m
-            else:
-                current = current & m
-        if current is not None:
-            groups.append(current)
-
-        final = groups[0]
-        for g in groups[1:]:
-            final = final | g
-
-        return df[final]
+        rows = self._snapshot_rows()
+        hit = self._result_cache.get((id(df), rows))
+        if hit is not None and hit[0]() is df:
+            # same frame, same filters (redraw, tab switch, or the background pass from _fire())
+            return df if hit[1] is None else df.iloc[hit[1]]
+        return self._apply_rows(df, rows)
 
     # ---------------- Presets API (FIX) ----------------
     def get_config(self) -> Dict[str, Any]:
@@ -290,16 +576,66 @@ class FiltersFrame(ttk.Frame):
         for r in self.rows:
             r["frame"].destroy()
         self.rows = []
+        self._result_cache.clear()
         self.add_row()
         if not silent:
             self._changed()
 
     def refresh_source_df(self, df):
         self.df = df
+        self._view_cache.clear()
+        self._result_cache.clear()
         for r in self.rows:
             r["cmp_cb"]["values"] = self._columns()
             self._populate_values(r)
 
+    # Tk fires a burst of events per edit (trace + KeyRelease + ComboboxSelected);
+    # wait this long after the last one before re-running the filters once.
+    DEBOUNCE_MS = 150
+
     def _changed(self):
+        if not callable(self.on_change):
+            return
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(self.DEBOUNCE_MS, self._fire)
+
+    POLL_MS = 30
+
+    def _fire(self):
+        self._pending = None
+        if not callable(self.on_change):
+            return
+        if self.df is None or self.df.empty:
+            self.on_change()
+            return
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excelops-filters")
+        self._future = self._executor.submit(self._apply_rows, self.df, self._snapshot_rows(), self._generation)
+        self.after(self.POLL_MS, self._poll, self._future)
+
+    def _poll(self, future: Future):
+        if future is not self._future:
+            return  # superseded by a newer edit
+        if not future.done():
+            self.after(self.POLL_MS, self._poll, future)
+            return
+        self._future = None
+        # on_change always runs here on the Tk thread; if the worker failed, its
+        # apply_filters() simply recomputes (and reports) synchronously as before
         if callable(self.on_change):
             self.on_change()
+
+    def destroy(self):
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+            self._pending = None
+        self._generation += 1
+        self._future = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        super().destroy()
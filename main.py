@@ -1,12 +1,6 @@
 # main.py
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, simpledialog
-import pandas as pd
-import os
 import sys
 
-from vlookup_helper import perform_vlookup
-from vlookup_frame import VlookupFrame
 
 def is_batch_mode() -> bool:
     """
@@ -17,6 +11,39 @@ def is_batch_mode() -> bool:
     return "--batch" in sys.argv
 
 
+def run_batch_mode():
+    """
+    Entry point for Activity Log automation.
+    This will be expanded step-by-step.
+    """
+    print("🔁 ExcelOps running in BATCH MODE")
+
+    # Placeholder – next steps will fill this
+    print("✔ Batch mode initialized successfully")
+
+
+if __name__ == "__main__" and is_batch_mode():
+    # batch mode needs neither Tk nor pandas: leave before the GUI imports below
+    run_batch_mode()
+    sys.exit(0)
+
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, simpledialog
+import numpy as np
+import pandas as pd
+import copy
+import json
+import os
+import re
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+
+from utils import excel_writer
+from vlookup_helper import clear_lookup_cache, load_lookup_file, perform_vlookup
+from vlookup_frame import VlookupFrame
+
 # Existing helper frames (must exist already)
 from filters import FiltersFrame
 from sorts import SortsFrame
@@ -35,9 +62,19 @@ class ExcelOpsApp(tk.Tk):
         self.configure(bg="#f4f6f8")
 
         self.df: pd.DataFrame | None = None
+        # bumped whenever self.df is replaced; part of each sheet's pipeline cache key
+        self._df_version = 0
+        self._pending_preview = None  # after() id of a debounced update_preview
+        # file parsing runs here, off the Tk thread (see load_file)
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excelops-io")
+        self._load_progress: str | None = None
+        # tree path -> {"vals", "index", "loaded", "index_map"}: rows still to page into a preview tree
+        self._tree_pages: dict[str, dict] = {}
+        # (weakref to df, n, values, index) of the last _preview_arrays() conversion
+        self._preview_arr_cache: tuple | None = None
         self.datasets: dict[str, pd.DataFrame] = {}
         self.active_dataset_name: str | None = None
-        self.preview_row_index_map: dict[str, int] = {}
+        self.preview_row_index_map: dict[str, object] = {}  # tree iid (row position) -> df index label
         self.preview_deletable = False
         self._last_csv_sep: str | None = None
         self._last_csv_encoding: str | None = None
@@ -45,6 +82,11 @@ class ExcelOpsApp(tk.Tk):
         self.lookup_df: pd.DataFrame | None = None
         # sheets: list of dicts {name, tab, inner_nb, filters, sorts, columns, pivot}
         self.sheets = []
+        # name -> first sheet index, tab path -> sheet index; see _sheet_index()
+        self._sheet_by_name: dict[str, int] = {}
+        self._sheet_by_tab: dict[str, int] = {}
+        # highest N among sheets named "SheetN", kept by _reindex_sheets(); see _next_sheet_name()
+        self._sheet_counter = 0
         self.plus_tab = None  # identifier for '+' tab
         self.preview_tab_id = None  # stores preview tab id if open
 
@@ -330,7 +372,9 @@ class ExcelOpsApp(tk.Tk):
             self.runner_preview_tree.pack(side="left", fill="both", expand=True)
             vs = ttk.Scrollbar(tree_holder, orient="vertical", command=self.runner_preview_tree.yview)
             hs = ttk.Scrollbar(tree_holder, orient="horizontal", command=self.runner_preview_tree.xview)
-            self.runner_preview_tree.configure(yscrollcommand=vs.set, xscrollcommand=hs.set)
+            self.runner_preview_tree.configure(
+                yscrollcommand=self._paged_yscroll(self.runner_preview_tree, vs), xscrollcommand=hs.set
+            )
             vs.pack(side="right", fill="y")
             hs.pack(side="bottom", fill="x")
 
@@ -351,7 +395,7 @@ class ExcelOpsApp(tk.Tk):
         if not hasattr(self, "runner_preview_tree"):
             return
         target = self.runner_preview_selector.get()
-        sheet = next((s for s in self.sheets if s["name"] == target), None)
+        sheet = self._sheet_named(target)
         df = self._generate_filtered_df(sheet) if sheet else self.df
         self._render_df_into_tree(df, self.runner_preview_tree)
 
@@ -437,6 +481,7 @@ class ExcelOpsApp(tk.Tk):
         tools_m = tk.Menu(m, tearoff=False)
         m.add_cascade(label="Tools", menu=tools_m)
         tools_m.add_command(label="VLOOKUP…", command=self.apply_vlookup)
+        tools_m.add_command(label="Clear Lookup Cache", command=self._clear_lookup_cache)
 
         edit_m = tk.Menu(m, tearoff=False)
         m.add_cascade(label="Edit", menu=edit_m)
@@ -520,11 +565,20 @@ class ExcelOpsApp(tk.Tk):
         self.update_preview()
 
     def _create_preview_tree_holder(self):
-        # Create a reusable treeview for the preview tab (created hidden initially)
-        self.preview_tree = ttk.Treeview(self, show="headings", selectmode="extended")
-        self.preview_vs = ttk.Scrollbar(self, orient="vertical", command=self.preview_tree.yview)
-        self.preview_hs = ttk.Scrollbar(self, orient="horizontal", command=self.preview_tree.xview)
-        self.preview_tree.configure(yscrollcommand=self.preview_vs.set, xscrollcommand=self.preview_hs.set)
+        # The Preview tab's frame and tree are built once; open_preview_tab only (re)adds the tab
+        self.preview_frame = ttk.Frame(self.nb)
+        tree_holder = ttk.Frame(self.preview_frame)
+        tree_holder.pack(fill="both", expand=True)
+        self.preview_tree = ttk.Treeview(tree_holder, show="headings", selectmode="extended")
+        self.preview_tree.pack(side="left", fill="both", expand=True)
+        self.preview_vs = ttk.Scrollbar(tree_holder, orient="vertical", command=self.preview_tree.yview)
+        self.preview_hs = ttk.Scrollbar(tree_holder, orient="horizontal", command=self.preview_tree.xview)
+        self.preview_tree.configure(
+            yscrollcommand=self._paged_yscroll(self.preview_tree, self.preview_vs),
+            xscrollcommand=self.preview_hs.set,
+        )
+        self.preview_vs.pack(side="right", fill="y")
+        self.preview_hs.pack(side="bottom", fill="x")
 
     # ---------------- File ops ----------------
     def load_file(self):
@@ -542,6 +596,26 @@ class ExcelOpsApp(tk.Tk):
         if not paths:
             return
 
+        # Parse on the I/O worker so the window keeps repainting; finish on the Tk thread.
+        dialog = self._busy_dialog(f"Loading {len(paths)} file(s)…")
+        future = self._io_pool.submit(self._read_paths, paths)
+        self.after(50, self._poll_load, future, dialog)
+
+    def _busy_dialog(self, text: str) -> tk.Toplevel:
+        dialog = tk.Toplevel(self)
+        dialog.title("Loading")
+        dialog.transient(self)
+        dialog.resizable(False, False)
+        ttk.Label(dialog, text=text).pack(padx=24, pady=(18, 8))
+        bar = ttk.Progressbar(dialog, mode="indeterminate", length=260)
+        bar.pack(padx=24, pady=(0, 18))
+        bar.start(12)
+        dialog.protocol("WM_DELETE_WINDOW", lambda: None)  # not cancellable mid-parse
+        dialog.grab_set()
+        return dialog
+
+    def _read_paths(self, paths) -> tuple[dict[str, pd.DataFrame], list[str]]:
+        # runs on the I/O worker: no Tk calls in here
         loaded: dict[str, pd.DataFrame] = {}
         errors = []
         for path in paths:
@@ -550,7 +624,25 @@ class ExcelOpsApp(tk.Tk):
                 loaded[self._unique_dataset_name(os.path.basename(path), loaded)] = df
             except Exception as e:
                 errors.append(f"{os.path.basename(path)}: {e}")
+        return loaded, errors
+
+    def _poll_load(self, future, dialog):
+        if self._load_progress:
+            self.status_var.set(self._load_progress)
+        if not future.done():
+            self.after(50, self._poll_load, future, dialog)
+            return
+        self._load_progress = None
+        dialog.grab_release()
+        dialog.destroy()
+        try:
+            loaded, errors = future.result()
+        except Exception as e:
+            messagebox.showerror("Load error", str(e))
+            return
+        self._finish_load(loaded, errors)
 
+    def _finish_load(self, loaded: dict[str, pd.DataFrame], errors: list[str]):
         if not loaded:
             messagebox.showerror("Load error", "No files could be loaded.\n\n" + "\n".join(errors))
             return
@@ -558,6 +650,7 @@ class ExcelOpsApp(tk.Tk):
         self.datasets = loaded
         self.active_dataset_name = next(iter(self.datasets))
         self.df = self.datasets[self.active_dataset_name]
+        self._df_version += 1
         self._reset_workspace_for_dataset()
         self._refresh_dataset_selector()
         self.status_var.set(f"Loaded {len(self.datasets)} file(s) — ready to build workflow")
@@ -588,6 +681,7 @@ class ExcelOpsApp(tk.Tk):
         for t in list(self.nb.tabs()):
             self.nb.forget(t)
         self.sheets.clear()
+        self._reindex_sheets()
         self.plus_tab = None
         self.preview_tab_id = None
         self.preview_row_index_map = {}
@@ -609,6 +703,7 @@ class ExcelOpsApp(tk.Tk):
             self.datasets[self.active_dataset_name] = self.df.reset_index(drop=True)
         self.active_dataset_name = name
         self.df = self.datasets[name].reset_index(drop=True)
+        self._df_version += 1
         self.datasets[name] = self.df
         self._refresh_filters_after_data_change()
         self._refresh_preview_selector()
@@ -636,13 +731,7 @@ class ExcelOpsApp(tk.Tk):
         self._last_csv_sep = sep
         for encoding in encodings:
             try:
-                df = pd.read_csv(
-                    path,
-                    sep=sep,
-                    engine="python",
-                    encoding=encoding,
-                    index_col=False
-                )
+                df = self._read_csv_with_engine(path, sep, encoding)
                 self._last_csv_encoding = encoding
                 break
             except Exception:
@@ -654,6 +743,86 @@ class ExcelOpsApp(tk.Tk):
             df = self._retry_common_delimiters(path, encodings, df)
         return df
 
+    def _read_csv_with_engine(self, path: str, sep: str | None, encoding: str) -> pd.DataFrame:
+        """
+        Parse with pandas' C tokenizer when the delimiter is a single character,
+        falling back to the (much slower) python engine for sniffing (sep=None),
+        multi-char/regex delimiters, or lines the C parser rejects.
+        """
+        if sep is not None and len(sep) == 1:
+            try:
+                if os.path.getsize(path) > self.CSV_CHUNKED_BYTES:
+                    return self._read_csv_chunked(path, sep, encoding)
+                return pd.read_csv(path, sep=sep, engine="c", encoding=encoding, index_col=False)
+            except UnicodeDecodeError:
+                raise
+            except Exception:
+                pass
+        return pd.read_csv(path, sep=sep, engine="python", encoding=encoding, index_col=False)
+
+    # CSVs above this size are read in chunks with progress in the status bar
+    CSV_CHUNKED_BYTES = 50 * 1024 * 1024
+    # read_csv's default NA markers: a parsed text column never holds these
+    CSV_NA_MARKERS = (
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+        "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    )
+
+    def _read_csv_chunked(self, path: str, sep: str, encoding: str, chunksize: int = 250_000) -> pd.DataFrame:
+        frames = []
+        rows = 0
+        name = os.path.basename(path)
+        with pd.read_csv(
+            path, sep=sep, engine="c", encoding=encoding, index_col=False, chunksize=chunksize
+        ) as reader:
+            for chunk in reader:
+                frames.append(chunk)
+                rows += len(chunk)
+                self._report_load_progress(f"Loading {name}: {rows:,} rows…")
+        # Each chunk infers its own dtypes, and concatenating disagreeing chunks
+        # gives mixed object columns (7 and "abc") where a single read_csv gives
+        # text with the original spelling ("007"). Those columns are parsed again
+        # whole, so the parser infers their dtype over every row.
+        # The chunked parser can also keep NA markers ("", "NA", "nan") as text in
+        # a chunk holding integers past int64; a single read never does.
+        mixed = [
+            pos for pos in range(len(frames[0].columns))
+            if not self._chunk_dtypes_agree([f.dtypes.iloc[pos] for f in frames])
+            or any(
+                f.dtypes.iloc[pos].kind == "O" and f.iloc[:, pos].isin(self.CSV_NA_MARKERS).any()
+                for f in frames
+            )
+        ]
+        df = pd.concat(frames, ignore_index=True)
+        if mixed:
+            self._report_load_progress(f"Loading {name}: re-reading {len(mixed)} mixed-type column(s)…")
+            # low_memory=False: the default parses in internal blocks and would
+            # mix types again, just as the chunks did
+            whole = pd.read_csv(
+                path, sep=sep, engine="c", encoding=encoding, index_col=False,
+                usecols=mixed, low_memory=False,
+            )
+            for i, pos in enumerate(mixed):
+                df.isetitem(pos, whole.iloc[:, i])
+        return df
+
+    @staticmethod
+    def _chunk_dtypes_agree(dtypes: list) -> bool:
+        """True when concatenating chunks of these dtypes gives what one read would."""
+        kinds = set(dtypes)
+        if len(kinds) == 1:
+            return True
+        # int chunks next to float ones (NaN-holding, or decimals) concat to
+        # float64, which is what the parser picks for the whole column too
+        return all(d == np.int64 or d == np.float64 for d in kinds)
+
+    def _report_load_progress(self, text: str):
+        if threading.current_thread() is threading.main_thread():
+            self.status_var.set(text)
+            self.update_idletasks()
+        else:
+            self._load_progress = text  # picked up by _poll_load on the Tk thread
+
     def _retry_common_delimiters(
         self,
         path: str,
@@ -665,13 +834,7 @@ class ExcelOpsApp(tk.Tk):
         for delim in (",", ";", "\t", "|"):
             for encoding in encodings:
                 try:
-                    candidate = pd.read_csv(
-                        path,
-                        sep=delim,
-                        engine="python",
-                        encoding=encoding,
-                        index_col=False
-                    )
+                    candidate = self._read_csv_with_engine(path, delim, encoding)
                 except Exception:
                     continue
                 if len(candidate.columns) > best_cols:
@@ -691,12 +854,18 @@ class ExcelOpsApp(tk.Tk):
             if header_counts[best_header] > 0:
                 return best_header
         best = (None, 1, float("inf"))
+        # Without quote characters a field count is just delimiters + 1, so the
+        # csv module is only needed when quoting could hide delimiters.
+        quoted = any('"' in line for line in sample_lines)
         for delim in candidates:
-            try:
-                reader = csv.reader(sample_lines, delimiter=delim)
-                counts = [len(row) for row in reader if row]
-            except Exception:
-                continue
+            if not quoted:
+                counts = [line.count(delim) + 1 for line in sample_lines]
+            else:
+                try:
+                    reader = csv.reader(sample_lines, delimiter=delim)
+                    counts = [len(row) for row in reader if row]
+                except Exception:
+                    continue
             if not counts:
                 continue
             counts.sort()
@@ -724,22 +893,24 @@ class ExcelOpsApp(tk.Tk):
         if not delimiter:
             return df
         try:
-            return pd.read_csv(path, sep=delimiter, engine="python")
+            return pd.read_csv(path, sep=delimiter, engine="c" if len(delimiter) == 1 else "python")
         except Exception:
             return df
 
     # ---------------- Sheets ----------------
+    _SHEET_NAME_RE = re.compile(r"Sheet(\d+)")
+
     def _next_sheet_name(self):
-        base = "Sheet"
-        existing = {s["name"] for s in self.sheets}
-        i = 1
+        # _reindex_sheets() keeps the counter at the highest suffix in use; the
+        # membership test is only a cheap guard, not a scan
         while True:
-            cand = f"{base}{i}"
-            if cand not in existing:
+            self._sheet_counter += 1
+            cand = f"Sheet{self._sheet_counter}"
+            if cand not in self._sheet_by_name:
                 return cand
-            i += 1
 
-    def add_sheet(self, name="Sheet"):
+    def add_sheet(self, name="Sheet", configs: dict | None = None):
+        """configs: optional {"filters"|"sorts"|"columns"|"pivot"|"vlookup": cfg} loaded into the new frames."""
         if self.df is None:
             messagebox.showwarning("No data", "Load a file first.")
             return
@@ -769,6 +940,22 @@ class ExcelOpsApp(tk.Tk):
         if self.lookup_df is not None:
             vlookup_frame.set_lookup_source(self.lookup_path or "", list(self.lookup_df.columns))
 
+        # populate the frames before the sheet is registered and previewed
+        for part, frame in (
+            ("filters", filters_frame),
+            ("sorts", sorts_frame),
+            ("columns", columns_frame),
+            ("pivot", pivot_frame),
+            ("vlookup", vlookup_frame),
+        ):
+            cfg = (configs or {}).get(part)
+            if cfg is None:
+                continue
+            try:
+                frame.load_config(cfg)
+            except Exception:
+                pass
+
         inner_nb.add(filters_frame, text="Filter")
         inner_nb.add(sorts_frame, text="Sort")
         inner_nb.add(columns_frame, text="Columns")
@@ -787,8 +974,10 @@ class ExcelOpsApp(tk.Tk):
             "vlookup_base_df": None,
             "final_output_df": None,
             "workflow_output_finalized": False,
+            "_cache": {},  # pipeline key -> filters/sorts/columns output, see _base_pipeline_df
         }
         self.sheets.append(sheet)
+        self._reindex_sheets()
 
         # recreate plus tab to remain at end
         self._ensure_plus_tab()
@@ -807,7 +996,7 @@ class ExcelOpsApp(tk.Tk):
             if tab_index < 0 or tab_index >= len(tab_list):
                 return
             tab_id = tab_list[tab_index]
-            idx = next((i for i, s in enumerate(self.sheets) if str(s["tab"]) == tab_id), None)
+            idx = self._sheet_index_for_tab(tab_id)
         if idx is None:
             return
         cur = self.sheets[idx]["name"]
@@ -815,6 +1004,7 @@ class ExcelOpsApp(tk.Tk):
         if not new:
             return
         self.sheets[idx]["name"] = new
+        self._reindex_sheets()
         try:
             self.nb.tab(self.sheets[idx]["tab"], text=new)
         except Exception:
@@ -827,23 +1017,16 @@ class ExcelOpsApp(tk.Tk):
         if idx is None:
             return
         src = self.sheets[idx]
-        new_name = self._next_sheet_name()
-        self.add_sheet(new_name)
-        dst = self.sheets[-1]
-        # copy configs if frames expose config functions
-        try:
-            dst["filters"].load_config(src["filters"].get_config())
-            # after load, ensure the df is set on the dst filters so values populate
-            if hasattr(dst["filters"], "refresh_source_df"):
-                dst["filters"].refresh_source_df(self.df)
-            dst["sorts"].load_config(src["sorts"].get_config())
-            dst["columns"].load_config(src["columns"].get_config())
-            dst["pivot"].load_config(src["pivot"].get_config())
-            if "vlookup" in src and "vlookup" in dst:
-                dst["vlookup"].load_config(src["vlookup"].get_config())
-        except Exception:
-            pass
-        self.update_preview()
+        # deep copies: load_config keeps some cfg lists/dicts as-is, which
+        # would otherwise be shared between the two sheets' frames
+        configs = {}
+        for part in ("filters", "sorts", "columns", "pivot", "vlookup"):
+            if part in src and hasattr(src[part], "get_config"):
+                try:
+                    configs[part] = copy.deepcopy(src[part].get_config())
+                except Exception:
+                    pass
+        self.add_sheet(self._next_sheet_name(), configs=configs)
 
     def close_sheet(self):
         idx = self._active_sheet_index()
@@ -854,6 +1037,7 @@ class ExcelOpsApp(tk.Tk):
         except Exception:
             pass
         self.sheets.pop(idx)
+        self._reindex_sheets()
         # ensure plus tab exists
         self._ensure_plus_tab()
         self._refresh_preview_selector()
@@ -882,13 +1066,43 @@ class ExcelOpsApp(tk.Tk):
                 return None
             if self.preview_tab_id and sel == self.preview_tab_id:
                 return None
-            for i, s in enumerate(self.sheets):
-                if str(s["tab"]) == sel:
-                    return i
+            return self._sheet_index_for_tab(sel)
         except Exception:
             pass
         return None
 
+    def _reindex_sheets(self):
+        self._sheet_by_name = {}
+        self._sheet_by_tab = {}
+        self._sheet_counter = 0
+        for i, s in enumerate(self.sheets):
+            self._sheet_by_name.setdefault(s["name"], i)
+            self._sheet_by_tab[str(s["tab"])] = i
+            m = self._SHEET_NAME_RE.fullmatch(s["name"])
+            if m:
+                self._sheet_counter = max(self._sheet_counter, int(m.group(1)))
+
+    def _sheet_index(self, index_map: str, key, field) -> int | None:
+        """
+        O(1) lookup in _sheet_by_name / _sheet_by_tab. A hit is verified against
+        self.sheets, so edits made without _reindex_sheets() (e.g. presets clearing
+        the list) only cost one rebuild instead of a wrong answer.
+        """
+        for attempt in range(2):
+            i = getattr(self, index_map).get(key)
+            if i is not None and i < len(self.sheets) and field(self.sheets[i]) == key:
+                return i
+            if attempt == 0:
+                self._reindex_sheets()
+        return None
+
+    def _sheet_named(self, name):
+        i = self._sheet_index("_sheet_by_name", name, lambda s: s["name"])
+        return None if i is None else self.sheets[i]
+
+    def _sheet_index_for_tab(self, tab_id) -> int | None:
+        return self._sheet_index("_sheet_by_tab", str(tab_id), lambda s: str(s["tab"]))
+
     def _build_vlookup_frame(self, parent):
         return VlookupFrame(parent, self.apply_vlookup, self.choose_lookup_file)
 
@@ -900,15 +1114,50 @@ class ExcelOpsApp(tk.Tk):
         if not path:
             return None, None
         try:
-            if path.lower().endswith(".csv"):
-                lookup_df = self._read_csv_safely(path)
-            else:
-                lookup_df = pd.read_excel(path)
+            lookup_df = self._read_lookup_responsive(path)
         except Exception as e:
             messagebox.showerror("Lookup load error", str(e))
             return None, None
         return path, lookup_df
 
+    def _clear_lookup_cache(self):
+        clear_lookup_cache()
+        self.status_var.set("Lookup cache cleared — lookup files will be re-read")
+
+    def _read_lookup_responsive(self, path: str) -> pd.DataFrame:
+        return self._run_responsive(
+            f"Loading lookup file {os.path.basename(path)}…", load_lookup_file, self, path
+        )
+
+    def _run_responsive(self, text: str, fn, *args):
+        """
+        fn(*args) on the I/O worker while a local event loop keeps the window
+        painting; returns (or raises) exactly like a direct call. fn must not
+        touch Tk.
+        """
+        future = self._io_pool.submit(fn, *args)
+        try:
+            return future.result(timeout=0.05)  # quick jobs: no dialog flash
+        except FuturesTimeout:
+            pass
+        dialog = self._busy_dialog(text)
+        done = tk.BooleanVar(dialog, value=False)
+
+        def poll():
+            if self._load_progress:
+                self.status_var.set(self._load_progress)
+            if future.done():
+                done.set(True)
+            else:
+                self.after(50, poll)
+
+        self.after(50, poll)
+        dialog.wait_variable(done)
+        self._load_progress = None
+        dialog.grab_release()
+        dialog.destroy()
+        return future.result()
+
     def choose_lookup_file(self):
         path, lookup_df = self._prompt_lookup_file()
         if lookup_df is None:
@@ -926,9 +1175,7 @@ class ExcelOpsApp(tk.Tk):
         if not path:
             return None
         try:
-            if path.lower().endswith(".csv"):
-                return self._read_csv_safely(path)
-            return pd.read_excel(path)
+            return self._read_lookup_responsive(path)
         except Exception:
             return None
 
@@ -951,6 +1198,10 @@ class ExcelOpsApp(tk.Tk):
             # generating a pivot but before input_mode existed.
             preset_cfg["input_mode"] = "pivot_result"
 
+        # The lookup frame is read in full here, not projected to this step's
+        # columns: it becomes self.lookup_df, fills the VLOOKUP listboxes and is
+        # reused by later steps that fetch other columns. Only perform_vlookup's
+        # own file-dialog read is projected (_lookup_usecols).
         lookup_path = self.lookup_path
         lookup_df = self.lookup_df
         preset_lookup_path = (preset_cfg or {}).get("lookup_file", "").strip()
@@ -1034,7 +1285,8 @@ class ExcelOpsApp(tk.Tk):
         can represent workflows such as: pivot -> VLOOKUP1 -> VLOOKUP2 ->
         calculations/column editing.
         """
-        df = self.df.copy()
+        # no copy: every stage returns a new frame (or its input untouched)
+        df = self.df
         try:
             df = sheet["filters"].apply_filters(df)
         except Exception:
@@ -1130,6 +1382,7 @@ class ExcelOpsApp(tk.Tk):
             except Exception:
                 pass
         self.sheets.clear()
+        self._reindex_sheets()
         self.plus_tab = None
         self.preview_tab_id = None
 
@@ -1179,7 +1432,7 @@ class ExcelOpsApp(tk.Tk):
         return candidate
 
     def _write_workbook(self, dest: str):
-        with pd.ExcelWriter(dest, engine="openpyxl") as writer:
+        with excel_writer(dest) as writer:
             used = set()
             for sheet in self.sheets:
                 df = self._generate_filtered_df(sheet)
@@ -1219,6 +1472,7 @@ class ExcelOpsApp(tk.Tk):
             return
         try:
             self.df = self._read_data_file(main_path).reset_index(drop=True)
+            self._df_version += 1
         except Exception as e:
             if runner_mode:
                 self.deiconify()
@@ -1267,26 +1521,14 @@ class ExcelOpsApp(tk.Tk):
         if self.preview_tab_id and self.preview_tab_id in self.nb.tabs():
             self.nb.select(self.preview_tab_id)
             return
-        # create frame and place before plus tab
-        pf = ttk.Frame(self.nb)
-        # place before plus tab if exists
+        # re-add the prebuilt preview frame, before the plus tab if it exists
+        pf = self.preview_frame
         if self.plus_tab and self.plus_tab in self.nb.tabs():
             self.nb.insert(self.plus_tab, pf, text="Preview")
         else:
             self.nb.add(pf, text="Preview")
         self.preview_tab_id = str(pf)
 
-        # attach the reusable preview_tree and scrollbars into this frame
-        tree_holder = ttk.Frame(pf)
-        tree_holder.pack(fill="both", expand=True)
-        self.preview_tree = ttk.Treeview(tree_holder, show="headings", selectmode="extended")
-        self.preview_tree.pack(side="left", fill="both", expand=True)
-        vs = ttk.Scrollbar(tree_holder, orient="vertical", command=self.preview_tree.yview)
-        hs = ttk.Scrollbar(tree_holder, orient="horizontal", command=self.preview_tree.xview)
-        self.preview_tree.configure(yscrollcommand=vs.set, xscrollcommand=hs.set)
-        vs.pack(side="right", fill="y")
-        hs.pack(side="bottom", fill="x")
-
         # select this tab
         self.nb.select(pf)
         # update preview to current selection
@@ -1326,7 +1568,7 @@ class ExcelOpsApp(tk.Tk):
         if raw or target == "Raw Data" or not self.sheets:
             df = self.df
         else:
-            sheet = next((s for s in self.sheets if s["name"] == target), None)
+            sheet = self._sheet_named(target)
             if not sheet:
                 df = self.df
             else:
@@ -1341,6 +1583,7 @@ class ExcelOpsApp(tk.Tk):
         except Exception:
             pass
         self.preview_row_index_map = {}
+        self._tree_pages.pop(str(tree_widget), None)
         if df is None or df.empty:
             tree_widget["columns"] = ()
             self.preview_deletable = False
@@ -1348,19 +1591,73 @@ class ExcelOpsApp(tk.Tk):
         cols = list(df.columns)
         tree_widget["columns"] = cols
         tree_widget["show"] = "headings"
-        for c in cols:
-            tree_widget.heading(c, text=str(c))
-            tree_widget.column(c, width=max(120, min(360, 10 * len(str(c)))), anchor="w")
         n = len(df) if self.show_all_var.get() else min(1000, len(df))
-        for i, (_, row) in enumerate(df.head(n).iterrows()):
-            vals = [("" if pd.isna(row[c]) else row[c]) for c in cols]
-            iid = str(row.name)
-            if iid in self.preview_row_index_map:
-                iid = f"{iid}-{i}"
-            self.preview_row_index_map[iid] = row.name
-            tree_widget.insert("", "end", iid=iid, values=vals)
+        vals_arr, index_arr = self._preview_arrays(df, n)
+        # size columns to the header and the first page's widest cell, in one
+        # vectorized string-length pass over that page
+        try:
+            sample = vals_arr[:self.PREVIEW_PAGE_SIZE].astype(str)
+            content_len = np.char.str_len(sample).max(axis=0)
+        except Exception:
+            content_len = np.zeros(len(cols), dtype=int)
+        for j, c in enumerate(cols):
+            text_len = max(len(str(c)), int(content_len[j]))
+            tree_widget.heading(c, text=str(c))
+            tree_widget.column(c, width=max(80, min(360, 8 * text_len + 16)), anchor="w")
+        # rows are inserted a page at a time as the user scrolls (see _paged_yscroll)
+        self._tree_pages[str(tree_widget)] = {
+            "vals": vals_arr,
+            "index": index_arr,
+            "loaded": 0,
+            "index_map": self.preview_row_index_map,
+        }
+        self._append_preview_page(tree_widget)
         self.preview_deletable = True
 
+    PREVIEW_PAGE_SIZE = 200
+
+    def _preview_arrays(self, df, n):
+        """
+        df.head(n) as (2-D object array with nulls blanked, index labels): one
+        conversion per render, pages only slice it. The last result is kept, so
+        re-rendering the same frame (e.g. a pipeline-cached sheet) reuses it.
+        """
+        cached = self._preview_arr_cache
+        if cached is not None and cached[0]() is df and cached[1] == n:
+            return cached[2], cached[3]
+        head = df.head(n)
+        vals_arr = head.to_numpy(dtype=object, na_value="")
+        index_arr = head.index.to_numpy()
+        self._preview_arr_cache = (weakref.ref(df), n, vals_arr, index_arr)
+        return vals_arr, index_arr
+
+    def _append_preview_page(self, tree_widget):
+        state = self._tree_pages.get(str(tree_widget))
+        if state is None or state["loaded"] >= len(state["vals"]):
+            return
+        start = state["loaded"]
+        stop = min(start + self.PREVIEW_PAGE_SIZE, len(state["vals"]))
+        vals_arr = state["vals"]
+        index_arr = state["index"]
+        index_map = state["index_map"]
+        # raw Tcl call per row: skips ttk.Treeview.insert's option formatting
+        tk_call = tree_widget.tk.call
+        tree_path = str(tree_widget)
+        for i in range(start, stop):
+            # the row position is unique even when index labels repeat
+            iid = str(i)
+            index_map[iid] = index_arr[i]
+            tk_call(tree_path, "insert", "", "end", "-id", iid, "-values", tuple(vals_arr[i]))
+        state["loaded"] = stop
+
+    def _paged_yscroll(self, tree_widget, scrollbar):
+        """yscrollcommand for a preview tree: moves the scrollbar and loads the next page near the bottom."""
+        def yscroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) > 0.9:
+                self._append_preview_page(tree_widget)
+        return yscroll
+
     # ---------------- Core df generation ----------------
     def _apply_result_columns(self, sheet, df: pd.DataFrame) -> pd.DataFrame:
         try:
@@ -1374,26 +1671,16 @@ class ExcelOpsApp(tk.Tk):
                 return sheet["final_output_df"].copy()
             return self._apply_result_columns(sheet, sheet["final_output_df"].copy())
         if sheet.get("vlookup_base_df") is not None:
-            df = sheet["vlookup_base_df"].copy()
+            # no copy: pivot and columns return new frames, and a stable input lets
+            # the pivot frame reuse its last result
+            df = sheet["vlookup_base_df"]
             try:
                 df = sheet["pivot"].apply_pivot_if_requested(df)
             except Exception:
                 pass
             return self._apply_result_columns(sheet, df)
 
-        df = self.df.copy()
-        try:
-            df = sheet["filters"].apply_filters(df)
-        except Exception:
-            pass
-        try:
-            df = sheet["sorts"].apply_sorts(df)
-        except Exception:
-            pass
-        try:
-            df = sheet["columns"].apply_columns(df)
-        except Exception:
-            pass
+        df = self._base_pipeline_df(sheet)
         try:
             # pivot is preview-only unless user generates a pivot sheet explicitly
             before_pivot = df
@@ -1407,7 +1694,32 @@ class ExcelOpsApp(tk.Tk):
     def _generate_base_df(self, sheet) -> pd.DataFrame:
         if sheet.get("vlookup_base_df") is not None:
             return sheet["vlookup_base_df"].copy()
-        df = self.df.copy()
+        return self._base_pipeline_df(sheet)
+
+    PIPELINE_CACHE_SIZE = 2
+
+    def _pipeline_key(self, sheet) -> tuple | None:
+        parts = [self._df_version]
+        for part in ("filters", "sorts", "columns"):
+            try:
+                parts.append(json.dumps(sheet[part].get_config(), sort_keys=True, default=str))
+            except Exception:
+                return None  # state we can't fingerprint: don't cache
+        return tuple(parts)
+
+    def _base_pipeline_df(self, sheet) -> pd.DataFrame:
+        """
+        self.df through the sheet's filters, sorts and columns. The result is cached
+        on the sheet under (df version, configs), so previews, exports and pivot
+        refreshes of an unchanged sheet skip the whole pipeline. Treat it as read-only.
+        """
+        cache = sheet.setdefault("_cache", {})
+        key = self._pipeline_key(sheet)
+        if key is not None and key in cache:
+            return cache[key]
+
+        # no copy: every stage returns a new frame (or its input untouched)
+        df = self.df
         try:
             df = sheet["filters"].apply_filters(df)
         except Exception:
@@ -1420,10 +1732,24 @@ class ExcelOpsApp(tk.Tk):
             df = sheet["columns"].apply_columns(df)
         except Exception:
             pass
+
+        if key is not None:
+            while len(cache) >= self.PIPELINE_CACHE_SIZE:
+                cache.pop(next(iter(cache)))
+            cache[key] = df
         return df
 
+    # widget edits arrive in bursts; re-render once this long after the last one
+    PREVIEW_DEBOUNCE_MS = 150
+
     def on_sheet_change(self):
         # called by inner frames to request live preview update
+        if self._pending_preview is not None:
+            self.after_cancel(self._pending_preview)
+        self._pending_preview = self.after(self.PREVIEW_DEBOUNCE_MS, self._run_pending_preview)
+
+    def _run_pending_preview(self):
+        self._pending_preview = None
         self.update_preview()
 
     def on_pivot_preview(self, pivot_df):
@@ -1458,7 +1784,7 @@ class ExcelOpsApp(tk.Tk):
             data = self.df
             sheet_name = "Raw Data"
         else:
-            sheet = next((s for s in self.sheets if s["name"] == name), None)
+            sheet = self._sheet_named(name)
             if not sheet:
                 messagebox.showwarning("No sheet", "Select a valid sheet to export.")
                 return
@@ -1469,7 +1795,7 @@ class ExcelOpsApp(tk.Tk):
             return
         try:
             # SINGLE sheet export (no Raw Data default unless requested)
-            with pd.ExcelWriter(dest, engine="openpyxl") as w:
+            with excel_writer(dest) as w:
                 data.to_excel(w, sheet_name=sheet_name[:31], index=False)
             messagebox.showinfo("Exported", f"Saved to {dest}")
         except Exception as e:
@@ -1510,8 +1836,10 @@ class ExcelOpsApp(tk.Tk):
             return
         if not messagebox.askyesno("Delete Rows", f"Delete {len(indices)} selected row(s) from the dataset?"):
             return
-        self.df = self.df.drop(index=indices, errors="ignore")
-        self.df = self.df.reset_index(drop=True)
+        # one hashed membership pass + a single gather, instead of drop()'s label lookups
+        keep = ~self.df.index.isin(indices)
+        self.df = self.df.iloc[keep].reset_index(drop=True)
+        self._df_version += 1
         if self.active_dataset_name:
             self.datasets[self.active_dataset_name] = self.df
         self._refresh_filters_after_data_change()
@@ -1545,20 +1873,6 @@ class ExcelOpsApp(tk.Tk):
             except Exception:
                 pass
 
-def run_batch_mode():
-    """
-    Entry point for Activity Log automation.
-    This will be expanded step-by-step.
-    """
-    print("🔁 ExcelOps running in BATCH MODE")
-
-    # Placeholder – next steps will fill this
-    print("✔ Batch mode initialized successfully")
-
-
 if __name__ == "__main__":
-    if is_batch_mode():
-        run_batch_mode()
-    else:
-        app = ExcelOpsApp()
-        app.mainloop()
+    app = ExcelOpsApp()
+    app.mainloop()
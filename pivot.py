@@ -1,9 +1,23 @@
 # pivot.py
+import weakref
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pandas as pd
 from pandas.api import types as ptypes
 
+try:
+    import polars as pl  # columnar, multi-threaded group-by for large pivots
+except ImportError:
+    pl = None
+
+try:
+    import pyarrow  # noqa: F401  (backs the "string[pyarrow]" key dtype)
+except ImportError:
+    pyarrow = None
+
+# inputs at least this long are aggregated in Polars when it is installed
+POLARS_MIN_ROWS = 200_000
+
 
 def _coerce_numeric_series(s: pd.Series) -> pd.Series:
     if ptypes.is_numeric_dtype(s):
@@ -17,6 +31,52 @@ def _coerce_numeric_series(s: pd.Series) -> pd.Series:
     )
 
 
+def _arrow_string_keys(df: pd.DataFrame, keys: list) -> list:
+    """
+    Move object-dtype key columns of df that hold only str (no missing values)
+    to "string[pyarrow]" in place, so the group-by hashes contiguous UTF-8
+    buffers instead of Python objects. Returns the converted column names.
+    """
+    if pyarrow is None:
+        return []
+    converted = [
+        c for c in dict.fromkeys(keys)
+        if df[c].dtype == object and ptypes.infer_dtype(df[c], skipna=False) == "string"
+    ]
+    for c in converted:
+        df[c] = df[c].astype("string[pyarrow]")
+    return converted
+
+
+def _polars_group_agg(df: pd.DataFrame, keys: list, vals: list, agg: str) -> pd.DataFrame:
+    """
+    df.groupby(keys, dropna=False, sort=True)[vals].agg(agg) computed in Polars.
+    Only the aggregation runs there; the (small) result comes back with the same
+    sorted key index, column order and dtypes, so the reshape stays in pandas.
+    Raises on anything it does not mirror exactly; callers fall back to pandas.
+    """
+    if agg != "count" and not all(
+        ptypes.is_numeric_dtype(df[c]) and not ptypes.is_bool_dtype(df[c]) for c in vals
+    ):
+        raise TypeError("non-numeric values")
+    exprs = {
+        "sum": lambda c: pl.col(c).sum(),
+        "mean": lambda c: pl.col(c).mean(),
+        "min": lambda c: pl.col(c).min(),
+        "max": lambda c: pl.col(c).max(),
+        "count": lambda c: pl.col(c).count().cast(pl.Int64),
+    }[agg]
+    out = (
+        pl.from_pandas(df[keys + vals])
+        .group_by(keys)
+        .agg([exprs(c) for c in vals])
+        .to_pandas()
+    )
+    for k in keys:
+        out[k] = out[k].astype(df[k].dtype)
+    return out.set_index(keys).sort_index()[vals]
+
+
 class PivotFrame(ttk.Frame):
     """
     Simple, Excel-like Pivot Table UI.
@@ -34,10 +94,18 @@ class PivotFrame(ttk.Frame):
         self.source_df = df
         self.data_provider = data_provider
 
-        self.value_col = tk.StringVar()
         self.generated = False  # pivot locked for export
         self._pending_config = None
         self._suspend_select_events = False
+        # (selection key, weakref to source df, pivot result) of the last _build_pivot()
+        self._pivot_cache: tuple | None = None
+        # (projection key, weakref to source df, (pivot_df, arrow_keys, groupby)):
+        # changing only the aggregation reuses the factorized group keys
+        self._group_cache: tuple | None = None
+        # listbox path -> selected items; cleared on every selection/content change
+        self._sel_cache: dict[str, list] = {}
+        # columns the three listboxes were last filled with
+        self._last_cols: tuple = ()
         self._build_ui()
 
     # ---------------- UI ----------------
@@ -115,23 +183,22 @@ class PivotFrame(ttk.Frame):
         selected_rows = self._selected(self.rows_lb) if keep_selection else []
         selected_cols = self._selected(self.cols_lb) if keep_selection else []
         selected_vals = self._selected(self.values_lb) if keep_selection else []
+        self._sel_cache.clear()
         self._suspend_select_events = True
         try:
             self.rows_lb.delete(0, "end")
             self.cols_lb.delete(0, "end")
             self.values_lb.delete(0, "end")
-            for c in cols:
-                self.rows_lb.insert("end", c)
-                self.cols_lb.insert("end", c)
-                self.values_lb.insert("end", c)
+            if cols:
+                # one Tcl call per listbox instead of one per column
+                self.rows_lb.insert("end", *cols)
+                self.cols_lb.insert("end", *cols)
+                self.values_lb.insert("end", *cols)
+            self._last_cols = tuple(cols)
             if keep_selection:
-                for i, c in enumerate(cols):
-                    if c in selected_rows:
-                        self.rows_lb.selection_set(i)
-                    if c in selected_cols:
-                        self.cols_lb.selection_set(i)
-                    if c in selected_vals:
-                        self.values_lb.selection_set(i)
+                self._select_items(self.rows_lb, cols, selected_rows)
+                self._select_items(self.cols_lb, cols, selected_cols)
+                self._select_items(self.values_lb, cols, selected_vals)
         finally:
             self._suspend_select_events = False
         if self._pending_config:
@@ -139,32 +206,50 @@ class PivotFrame(ttk.Frame):
 
     def refresh_source_df(self, df: pd.DataFrame | None):
         self.source_df = df
+        self._pivot_cache = None
+        self._group_cache = None
+        if (() if df is None else tuple(df.columns)) == self._last_cols:
+            # filters/sorts changed the rows only: the listboxes are already right
+            if self._pending_config:
+                self._apply_config_to_listboxes(self._pending_config)
+            return
         self._refresh_columns(keep_selection=True)
 
+    @staticmethod
+    def _select_items(lb, cols, wanted):
+        """Select every listbox row whose column is in wanted (set lookup, one call per row)."""
+        wanted = set(wanted)
+        for i, c in enumerate(cols):
+            if c in wanted:
+                lb.selection_set(i)
+
     def _selected(self, lb):
-        return [lb.get(i) for i in lb.curselection()]
+        # served from _sel_cache: preview, generate and get_config all re-read the
+        # same selections, and each read is a Tcl round trip per selected item
+        key = str(lb)
+        cached = self._sel_cache.get(key)
+        if cached is None:
+            cached = self._sel_cache[key] = [lb.get(i) for i in lb.curselection()]
+        return list(cached)
 
     def _mark_user_changed(self, _event=None):
+        self._sel_cache.clear()
         if self._suspend_select_events:
             return
         self._pending_config = None
 
     def _apply_config_to_listboxes(self, cfg: dict):
         cols = [] if self.source_df is None else list(self.source_df.columns)
+        self._sel_cache.clear()
         self._suspend_select_events = True
         try:
             self.rows_lb.selection_clear(0, "end")
             self.cols_lb.selection_clear(0, "end")
             self.values_lb.selection_clear(0, "end")
-            for i, c in enumerate(cols):
-                if c in cfg.get("rows", []):
-                    self.rows_lb.selection_set(i)
-                if c in cfg.get("columns", []):
-                    self.cols_lb.selection_set(i)
-                if c in cfg.get("values", []):
-                    self.values_lb.selection_set(i)
-                if "values" not in cfg and c == cfg.get("value", ""):
-                    self.values_lb.selection_set(i)
+            values = cfg["values"] if "values" in cfg else [cfg.get("value", "")]
+            self._select_items(self.rows_lb, cols, cfg.get("rows", []))
+            self._select_items(self.cols_lb, cols, cfg.get("columns", []))
+            self._select_items(self.values_lb, cols, values)
         finally:
             self._suspend_select_events = False
 
@@ -183,48 +268,74 @@ class PivotFrame(ttk.Frame):
         if not rows:
             return None
 
+        # preview -> generate -> export pivot the same frame with the same setup
+        key = (id(df), len(df), tuple(rows), tuple(cols), tuple(vals), agg)
+        cached = self._pivot_cache
+        if cached is not None and cached[0] == key and cached[1]() is df:
+            return cached[2]
+
         missing = [c for c in rows + cols + vals if c not in df.columns]
         if missing:
             messagebox.showerror("Pivot error", f"Missing column(s): {', '.join(sorted(set(missing)))}")
             return None
 
-        pivot_df = df.copy()
-        numeric_aggs = {"sum", "mean", "min", "max"}
-        if vals and agg in numeric_aggs:
-            for col in vals:
-                pivot_df[col] = _coerce_numeric_series(pivot_df[col])
+        numeric = bool(vals) and agg in {"sum", "mean", "min", "max"}
+        gkey = (id(df), len(df), tuple(rows), tuple(cols), tuple(vals), numeric)
+        gcached = self._group_cache
+        if gcached is not None and gcached[0] == gkey and gcached[1]() is df:
+            pivot_df, arrow_keys, grouped = gcached[2]
+        else:
+            # only the key and value columns, not a copy of the whole frame
+            pivot_df = df[list(dict.fromkeys(rows + cols + vals))]
+            if numeric:
+                for col in vals:
+                    values = _coerce_numeric_series(pivot_df[col])
+                    if ptypes.is_integer_dtype(values) and not ptypes.is_bool_dtype(values):
+                        # narrower ints to hash/aggregate; sums still come back as int64
+                        values = pd.to_numeric(values, downcast="integer")
+                    pivot_df[col] = values
+            arrow_keys = _arrow_string_keys(pivot_df, rows + cols)
+            grouped = None
 
         try:
+            if grouped is None:
+                # groupby + unstack instead of pd.pivot_table: same sorted result, but
+                # only observed key combinations are built, not their cartesian product
+                grouped = pivot_df.groupby(rows + cols, dropna=False, observed=True, sort=True)
+                self._group_cache = (gkey, weakref.ref(df), (pivot_df, arrow_keys, grouped))
             if vals:
-                pt = pd.pivot_table(
-                    pivot_df,
-                    index=rows,
-                    columns=cols if cols else None,
-                    values=vals,
-                    aggfunc=agg,
-                    fill_value=0,
-                    dropna=False,
-                )
+                pt = None
+                if pl is not None and len(pivot_df) >= POLARS_MIN_ROWS:
+                    try:
+                        pt = _polars_group_agg(pivot_df, rows + cols, vals, agg)
+                    except Exception:
+                        pt = None  # the pandas path below handles (and reports) it
+                if pt is None:
+                    pt = grouped[vals].agg(agg)
+                if cols:
+                    pt = pt.unstack(cols, fill_value=0).sort_index(axis=1)
+                pt = pt.fillna(0)
             else:
-                pt = pd.pivot_table(
-                    pivot_df,
-                    index=rows,
-                    columns=cols if cols else None,
-                    aggfunc="size",
-                    fill_value=0,
-                    dropna=False,
-                )
-                pt = pt.rename("Count")
+                pt = grouped.size()
+                if cols:
+                    pt = pt.unstack(cols, fill_value=0).sort_index(axis=1)
+                else:
+                    pt = pt.rename("Count").to_frame()
 
             if isinstance(pt.columns, pd.MultiIndex):
-                pt.columns = [" | ".join([str(c) for c in col if c != ""]) for col in pt.columns.values]
+                pt.columns = pt.columns.map(lambda col: " | ".join(str(c) for c in col if c != ""))
             elif isinstance(pt.columns, pd.Index):
                 pt.columns = [str(c) for c in pt.columns]
 
             out = pt.reset_index()
+            for c in arrow_keys:
+                if c in rows:
+                    # back to the default str dtype the object-key path produces
+                    out[c] = out[c].astype(str)
             if out.empty:
                 messagebox.showinfo("Pivot", "No rows produced for the selected pivot setup.")
                 return None
+            self._pivot_cache = (key, weakref.ref(df), out)
             return out
         except Exception as e:
             messagebox.showerror("Pivot error", str(e))
@@ -264,7 +375,10 @@ class PivotFrame(ttk.Frame):
 
     def reset(self):
         self._pending_config = None
+        self._pivot_cache = None
+        self._group_cache = None
         self.generated = False
+        self._sel_cache.clear()
         self._suspend_select_events = True
         try:
             self.rows_lb.selection_clear(0, "end")
@@ -272,7 +386,6 @@ class PivotFrame(ttk.Frame):
             self.values_lb.selection_clear(0, "end")
         finally:
             self._suspend_select_events = False
-        self.value_col.set("")
         self.agg_var.set("sum")
 
     # ---------------- presets ----------------
@@ -287,8 +400,9 @@ class PivotFrame(ttk.Frame):
         }
 
     def load_config(self, cfg: dict):
+        self._pivot_cache = None
+        self._group_cache = None
         self.generated = False
-        self.value_col.set("")
         self._pending_config = dict(cfg or {})
         self._apply_config_to_listboxes(self._pending_config)
         self.agg_var.set(cfg.get("agg", "sum"))
@@ -1,11 +1,38 @@
 # presets.py
 import os
 import json
+import sqlite3
+import time
+from contextlib import closing
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PRESET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "presets")
+# every preset lives in one table: presets(name, cfg JSON blob, mtime)
+PRESET_DB = os.path.join(PRESET_DIR, "presets.sqlite")
+# earlier builds renamed imported PRESET_DIR/*.json files to *.json.imported
+IMPORTED_SUFFIX = ".imported"
+
+
+def _json_loads(raw: bytes):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+
+
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        try:
+            # non-str keys: column-visibility maps are keyed by column name, which may be a number
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # a type only the stdlib encoder accepts (e.g. an int subclass)
+    return json.dumps(data, indent=2).encode("utf-8")
 
 
 class PresetManager:
@@ -17,30 +44,106 @@ class PresetManager:
     - Pivot
     """
 
-    # ---------- filesystem helpers ----------
+    # ---------- storage helpers ----------
+
+    _json_imported = False  # PRESET_DIR/*.json synced into PRESET_DB by this process
 
     @staticmethod
     def _ensure_dir():
         os.makedirs(PRESET_DIR, exist_ok=True)
 
     @staticmethod
-    def _preset_path(name: str) -> str:
-        return os.path.join(PRESET_DIR, f"{name}.json")
+    def _connect() -> sqlite3.Connection:
+        PresetManager._ensure_dir()
+        con = sqlite3.connect(PRESET_DB)
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS presets ("
+            "name TEXT PRIMARY KEY, cfg BLOB NOT NULL, mtime REAL NOT NULL)"
+        )
+        if not PresetManager._json_imported:
+            PresetManager._import_json_presets(con)
+            PresetManager._json_imported = True
+        return con
+
+    @staticmethod
+    def _restore_imported_files():
+        """Undo the *.json.imported renames of earlier builds (their rows are in the DB)."""
+        with os.scandir(PRESET_DIR) as it:
+            renamed = [e.path for e in it if e.name.endswith(".json" + IMPORTED_SUFFIX)]
+        for path in renamed:
+            original = path[: -len(IMPORTED_SUFFIX)]
+            try:
+                if os.path.exists(original):
+                    os.remove(path)  # superseded by a newer file of the same name
+                else:
+                    os.replace(path, original)
+            except OSError:
+                continue
+
+    @staticmethod
+    def _import_json_presets(con: sqlite3.Connection):
+        """
+        Sync PRESET_DIR/*.json (e.g. presets shipped with the repo) into the
+        table. The files are never moved or modified: a file newer than its row
+        replaces the row, an older one leaves a preset saved since untouched.
+        """
+        PresetManager._restore_imported_files()
+        known = dict(con.execute("SELECT name, mtime FROM presets"))
+        with os.scandir(PRESET_DIR) as it:
+            files = [
+                e for e in it
+                if e.name.endswith(".json") and not e.name.startswith(".") and e.is_file()
+            ]
+        for e in files:
+            name = e.name[:-5]
+            try:
+                mtime = e.stat().st_mtime
+                if name in known and known[name] >= mtime:
+                    continue  # row is as new as the file: skip the read
+                with open(e.path, "rb") as f:
+                    raw = f.read()
+                _json_loads(raw)  # skip files that are not valid JSON
+                with con:
+                    con.execute(
+                        "INSERT INTO presets (name, cfg, mtime) VALUES (?, ?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET cfg = excluded.cfg, mtime = excluded.mtime "
+                        "WHERE excluded.mtime > presets.mtime",
+                        (name, raw, mtime),
+                    )
+            except Exception:
+                continue
 
     @staticmethod
     def list_presets():
-        PresetManager._ensure_dir()
-        return sorted(
-            f[:-5] for f in os.listdir(PRESET_DIR) if f.endswith(".json")
-        )
+        with closing(PresetManager._connect()) as con:
+            return [name for (name,) in con.execute("SELECT name FROM presets ORDER BY name")]
 
     @staticmethod
     def _load_raw_preset(name: str) -> dict:
-        path = PresetManager._preset_path(name)
-        if not os.path.exists(path):
+        with closing(PresetManager._connect()) as con:
+            row = con.execute("SELECT cfg FROM presets WHERE name = ?", (name,)).fetchone()
+        if row is None:
             raise FileNotFoundError(f"Preset not found: {name}")
-        with open(path, "r") as f:
-            return json.load(f)
+        return _json_loads(row[0])
+
+    @staticmethod
+    def _store_preset(name: str, data: dict):
+        payload = _json_dumps(data)
+        with closing(PresetManager._connect()) as con, con:
+            con.execute(
+                "INSERT INTO presets (name, cfg, mtime) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET cfg = excluded.cfg, mtime = excluded.mtime",
+                (name, payload, time.time()),
+            )
+
+    @staticmethod
+    def _delete_preset(name: str):
+        with closing(PresetManager._connect()) as con, con:
+            con.execute("DELETE FROM presets WHERE name = ?", (name,))
+        # a JSON file of that name would re-import the preset on the next start
+        path = os.path.join(PRESET_DIR, f"{name}.json")
+        if os.path.exists(path):
+            os.remove(path)
 
     # ---------- UI actions ----------
 
@@ -96,9 +199,6 @@ class PresetManager:
         if not name:
             return
 
-        PresetManager._ensure_dir()
-        path = PresetManager._preset_path(name)
-
         data = {
             "sheets": []
         }
@@ -119,8 +219,7 @@ class PresetManager:
             }
             data["sheets"].append(sheet_cfg)
 
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+        PresetManager._store_preset(name, data)
 
         messagebox.showinfo("Workflow Saved", f"Workflow '{name}' saved successfully.")
 
@@ -292,9 +391,8 @@ class PresetManager:
             if not sel:
                 return
             name = lb.get(sel[0])
-            path = PresetManager._preset_path(name)
             if messagebox.askyesno("Delete", f"Delete workflow '{name}'?"):
-                os.remove(path)
+                PresetManager._delete_preset(name)
                 lb.delete(sel[0])
 
         ttk.Button(win, text="Delete Selected", command=delete).pack(pady=6)
@@ -320,7 +418,8 @@ class PresetManager:
     def apply_preset_to_df(df: pd.DataFrame, preset_cfg: dict, extra_filters: dict | None = None):
         """
         Applies a SINGLE-SHEET preset to a dataframe.
-        Used by automation / watcher.
+        Used by automation / watcher. Pure pandas: builds no widgets, so it is
+        safe on worker threads and headless machines.
         """
 
         if not preset_cfg.get("sheets"):
@@ -330,29 +429,29 @@ class PresetManager:
 
         # Filters
         if "filters" in sheet_cfg:
-            from filters import FiltersFrame
-            f = FiltersFrame(None, None, df)
-            f.load_config(sheet_cfg["filters"])
-            df = f.apply_filters(df)
+            from filters import apply_filters_config
+            df = apply_filters_config(df, sheet_cfg["filters"])
 
         # Extra filters (e.g. User)
         if extra_filters:
-            for col, val in extra_filters.items():
-                if col in df.columns:
-                    df = df[df[col].astype(str) == str(val)]
+            col_set = set(df.columns)
+            relevant = {c: v for c, v in extra_filters.items() if c in col_set}
+            if relevant:
+                # one combined mask and a single slice, instead of a new frame per key
+                mask = np.ones(len(df), dtype=bool)
+                for col, val in relevant.items():
+                    mask &= df[col].astype(str).to_numpy() == str(val)
+                if not mask.all():
+                    df = df[mask]
 
         # Sorts
         if "sorts" in sheet_cfg:
-            from sorts import SortsFrame
-            s = SortsFrame(None, None, df)
-            s.load_config(sheet_cfg["sorts"])
-            df = s.apply_sorts(df)
+            from sorts import apply_sorts_config
+            df = apply_sorts_config(df, sheet_cfg["sorts"])
 
         # Columns
         if "columns" in sheet_cfg:
-            from columns_manager import ColumnsManagerFrame
-            c = ColumnsManagerFrame(None, None, df)
-            c.load_config(sheet_cfg["columns"])
-            df = c.apply_columns(df)
+            from columns_manager import apply_columns_config
+            df = apply_columns_config(df, sheet_cfg["columns"])
 
         return df
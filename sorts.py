@@ -55,6 +55,81 @@ def _coerce_sort_key(s: pd.Series) -> pd.Series:
 
     return text.str.casefold()
 
+
+def _sort_groups(df: pd.DataFrame, items) -> list:
+    """[(join, col, order), ...] top to bottom -> [[(col, ascending), ...], ...], split at OR rows."""
+    # Build groups split by OR
+    groups = []  # list of [(col, asc), ...]
+    current = []
+    for i, (join, col, order) in enumerate(items):
+        if not col or col not in df.columns:
+            continue
+        asc = (order != "Descending")
+        if i == 0:
+            current.append((col, asc))
+        else:
+            if join == "OR":
+                # close previous group, start new
+                if current:
+                    groups.append(current)
+                current = [(col, asc)]
+            else:
+                current.append((col, asc))
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _sort_by_groups(df: pd.DataFrame, groups: list) -> pd.DataFrame:
+    """df reordered by _sort_groups() output (first group highest precedence)."""
+    if not groups:
+        return df
+
+    # A stable sort by group 2 then group 1 orders rows exactly like one
+    # lexicographic sort by group 1's keys followed by group 2's, so all groups
+    # collapse into a single sort_values call. A column repeated in a later
+    # group can no longer break ties, so only its first occurrence is kept.
+    flat = {}
+    for group in groups:
+        for c, a in group:
+            flat.setdefault(c, a)
+    cols = list(flat)
+    asc = list(flat.values())
+
+    # Sort a narrow frame of just the key columns (positional index), then
+    # reorder the full frame once with the resulting positions.
+    out = df[cols].reset_index(drop=True)
+    try:
+        out = out.sort_values(
+            by=cols,
+            ascending=asc,
+            na_position="last",
+            kind="mergesort",
+            key=_coerce_sort_key,
+        )
+    except Exception:
+        # fallback: ignore kind param
+        out = out.sort_values(by=cols, ascending=asc, na_position="last", key=_coerce_sort_key)
+    return df.take(out.index.to_numpy())
+
+
+def apply_sorts_config(df: pd.DataFrame, cfg: dict) -> pd.DataFrame:
+    """Sort df by a SortsFrame.get_config() dict without building any widgets."""
+    if df is None or df.empty:
+        return df
+    # the rows load_config() would create: reset()'s blank first row, then each
+    # saved level with its widget defaults ("AND", "Ascending") for bad values
+    items = [("AND", "", "Ascending")]
+    for tup in cfg.get("sorts", []):
+        j, c, o = ("AND", tup[0], tup[1]) if len(tup) == 2 else tup
+        items.append((
+            j if j in ("AND", "OR") else "AND",
+            str(c) if c else "",
+            o if o in ("Ascending", "Descending") else "Ascending",
+        ))
+    return _sort_by_groups(df, _sort_groups(df, items))
+
+
 class SortsFrame(ttk.Frame):
     """
     Multi-level sort with per-row Join (AND/OR).
@@ -78,6 +153,8 @@ class SortsFrame(ttk.Frame):
         self.on_change = on_change_callback
         self.df = df
         self.rows = []  # [{frame, join_var?, col_var, order_var, widgets...}]
+        # columns every row combobox currently lists (add_row reads them from self.df)
+        self._row_cols: tuple = tuple(self._columns_list())
         self._build_ui()
 
     # ---------- UI ----------
@@ -158,6 +235,8 @@ class SortsFrame(ttk.Frame):
             "order_var": order_var,
             "col_cb": col_cb,
             "ord_cb": ord_cb,
+            "rem_btn": rem_btn,
+            "pos": idx_alive,  # grid position among alive rows, see _regrid_rows
         }
         self.rows.append(row)
 
@@ -189,36 +268,30 @@ class SortsFrame(ttk.Frame):
         self._changed()
 
     def _regrid_rows(self):
-        alive = [r for r in self.rows if r is not None]
-        self.rows = []
-        for i, r in enumerate(alive):
+        """Close the gap left by a removed row: only rows whose position or join role changed are touched."""
+        self.rows = [r for r in self.rows if r is not None]
+        for i, r in enumerate(self.rows):
             rf = r["frame"]
-            for w in rf.grid_slaves():
-                w.grid_forget()
-            # rebuild join role
+            if r.get("pos") != i:
+                rf.grid(row=self.grid_start + i, column=0, sticky="ew", padx=2, pady=2)
+                r["pos"] = i
+            is_combo = isinstance(r["join_widget"], ttk.Combobox)
+            if (i == 0) != is_combo:
+                continue  # join role unchanged
+            try:
+                r["join_widget"].destroy()
+            except Exception:
+                pass
             if i == 0:
-                if isinstance(r["join_widget"], ttk.Combobox):
-                    try:
-                        r["join_widget"].destroy()
-                    except Exception:
-                        pass
-                    r["join_widget"] = ttk.Label(rf, text="—")
-                    r["join_var"] = None
+                r["join_widget"] = ttk.Label(rf, text="—")
+                r["join_var"] = None
             else:
-                if not isinstance(r["join_widget"], ttk.Combobox):
-                    jv = tk.StringVar(value="AND")
-                    jw = ttk.Combobox(rf, values=["AND","OR"], textvariable=jv, state="readonly", width=6)
-                    jw.bind("<<ComboboxSelected>>", lambda e: self._changed())
-                    r["join_widget"] = jw
-                    r["join_var"] = jv
-
+                jv = tk.StringVar(value="AND")
+                jw = ttk.Combobox(rf, values=["AND","OR"], textvariable=jv, state="readonly", width=6)
+                jw.bind("<<ComboboxSelected>>", lambda e: self._changed())
+                r["join_widget"] = jw
+                r["join_var"] = jv
             r["join_widget"].grid(row=0, column=0, padx=4, sticky="w")
-            r["col_cb"].grid(row=0, column=1, padx=4, sticky="w")
-            r["ord_cb"].grid(row=0, column=2, padx=4, sticky="w")
-            # restore/remove button
-            btn = ttk.Button(rf, text="✖", width=3, command=lambda fr=rf: self._remove_row(fr))
-            btn.grid(row=0, column=3, padx=4)
-            self.rows.append(r)
 
     def _changed(self):
         if callable(self.on_change):
@@ -228,50 +301,16 @@ class SortsFrame(ttk.Frame):
     def apply_sorts(self, df: pd.DataFrame) -> pd.DataFrame:
         if df is None or df.empty:
             return df
-
-        # Build groups split by OR
-        groups = []  # list of [(col, asc), ...]
-        current = []
         alive = [r for r in self.rows if r is not None]
-        for i, r in enumerate(alive):
-            col = r["col_var"].get()
-            if not col or col not in df.columns:
-                continue
-            asc = (r["order_var"].get() != "Descending")
-            if i == 0:
-                current.append((col, asc))
-            else:
-                join = r["join_var"].get() if r["join_var"] is not None else "AND"
-                if join == "OR":
-                    # close previous group, start new
-                    if current:
-                        groups.append(current)
-                    current = [(col, asc)]
-                else:
-                    current.append((col, asc))
-        if current:
-            groups.append(current)
-
-        if not groups:
-            return df
-
-        # Apply stable sorts: last group first → first group last (highest precedence)
-        out = df
-        for group in reversed(groups):
-            cols = [c for c,_ in group]
-            asc = [a for _,a in group]
-            try:
-                out = out.sort_values(
-                    by=cols,
-                    ascending=asc,
-                    na_position="last",
-                    kind="mergesort",
-                    key=_coerce_sort_key,
-                )
-            except Exception:
-                # fallback: ignore kind param
-                out = out.sort_values(by=cols, ascending=asc, na_position="last", key=_coerce_sort_key)
-        return out
+        items = [
+            (
+                r["join_var"].get() if r["join_var"] is not None else "AND",
+                r["col_var"].get(),
+                r["order_var"].get(),
+            )
+            for r in alive
+        ]
+        return _sort_by_groups(df, _sort_groups(df, items))
 
     # ---------- config ----------
     def get_config(self):
@@ -307,6 +346,9 @@ class SortsFrame(ttk.Frame):
     def refresh_columns(self, df: pd.DataFrame):
         self.df = df
         cols = self._columns_list()
+        if tuple(cols) == self._row_cols:
+            return  # rows changed, columns did not: nothing to push to the comboboxes
+        self._row_cols = tuple(cols)
         for r in [x for x in self.rows if x is not None]:
             try:
                 r["col_cb"]["values"] = cols
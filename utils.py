@@ -1,9 +1,87 @@
 # utils.py
+from functools import lru_cache
+
 import pandas as pd
 
+try:
+    import python_calamine  # noqa: F401  (Rust-backed streaming XLSX reader)
+    EXCEL_ENGINE: str | None = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+try:
+    import xlsxwriter  # noqa: F401  (faster, lower-memory writer than openpyxl)
+    EXCEL_WRITER_ENGINE = "xlsxwriter"
+except ImportError:
+    EXCEL_WRITER_ENGINE = "openpyxl"
+
+
+@lru_cache(maxsize=128)
+def split_csv(text: str) -> tuple[str, ...]:
+    """'a, b,,c' -> ('a', 'b', 'c'); each distinct list text (filter "in" values,
+    VLOOKUP key/column names) is parsed once."""
+    return tuple(c.strip() for c in text.split(",") if c.strip())
+
+
 def clean_numeric_series(s: pd.Series) -> pd.Series:
     """Strip percent signs and commas, coerce to numeric (float)."""
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        # already numeric: nothing to strip, skip the string round-trip entirely
+        return s
     s2 = s.astype(str).str.strip()
-    s2 = s2.str.replace("%", "", regex=False).str.replace(",", "", regex=False)
-    s2 = s2.replace({"": None, "nan": None})
+    # probe first: clean numeric text has neither character, and each replace is a full rewrite
+    if s2.str.contains("%", regex=False, na=False).any():
+        s2 = s2.str.replace("%", "", regex=False)
+    if s2.str.contains(",", regex=False, na=False).any():
+        s2 = s2.str.replace(",", "", regex=False)
+    # "" and "nan" need no mapping pass: to_numeric(errors="coerce") makes them NaN
     return pd.to_numeric(s2, errors="coerce")
+
+
+def read_excel_fast(path, **kwargs) -> pd.DataFrame:
+    """Read an Excel file with calamine when installed, else pandas' default (openpyxl)."""
+    if EXCEL_ENGINE:
+        try:
+            return pd.read_excel(path, engine=EXCEL_ENGINE, **kwargs)
+        except Exception:
+            # e.g. a workbook calamine cannot parse; openpyxl is slower but more lenient
+            pass
+    return pd.read_excel(path, **kwargs)
+
+
+def excel_writer(path) -> pd.ExcelWriter:
+    """ExcelWriter on xlsxwriter when installed, else openpyxl.
+
+    xlsxwriter's constant_memory mode is deliberately not enabled: pandas'
+    to_excel emits cells column by column, and constant_memory drops any cell
+    written to a row that has already been flushed.
+    """
+    return pd.ExcelWriter(path, engine=EXCEL_WRITER_ENGINE)
+
+
+def write_frames_streaming(frames, dest) -> None:
+    """
+    Write [(sheet_name, df), ...] to one workbook, streaming rows to disk.
+
+    Uses pandas' writer on xlsxwriter; on the openpyxl fallback it builds a
+    write-only workbook, so cells are serialized row by row instead of the
+    whole workbook being held as cell objects in memory.
+    """
+    if EXCEL_WRITER_ENGINE != "openpyxl":
+        with excel_writer(dest) as writer:
+            for sheet_name, df in frames:
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return
+
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for sheet_name, df in frames:
+        ws = wb.create_sheet(title=sheet_name)
+        ws.append([str(c) for c in df.columns])
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            ws.append(row)
+    if not wb.worksheets:
+        wb.create_sheet(title="Sheet1")
+    wb.save(dest)
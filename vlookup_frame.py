@@ -1,6 +1,16 @@
 import tkinter as tk
 from tkinter import ttk
 
+from utils import split_csv
+
+_HELP_TEXT = (
+    "How to use VLOOKUP:\n"
+    "1) Choose whether VLOOKUP should use the normal sheet output or generated pivot result.\n"
+    "2) Choose a lookup file. Its columns will appear below.\n"
+    "3) Pick the main key, lookup key, and lookup value column(s).\n"
+    "4) Click Run VLOOKUP. Preview updates automatically."
+)
+
 
 class VlookupFrame(ttk.Frame):
     def __init__(self, parent, on_vlookup, on_pick_lookup_file=None, columns=None):
@@ -9,6 +19,10 @@ class VlookupFrame(ttk.Frame):
         self.on_pick_lookup_file = on_pick_lookup_file
         self.columns = columns or []
         self.lookup_columns = []
+        # listbox path -> the items _refresh_listbox last filled it with
+        self._listbox_items = {}
+        # listbox path -> {stripped lowercase item: [positions]}, for by-name selection
+        self._listbox_positions = {}
         self.main_keys_var = tk.StringVar()
         self.lookup_keys_var = tk.StringVar()
         self.values_var = tk.StringVar()
@@ -19,19 +33,15 @@ class VlookupFrame(ttk.Frame):
         self.same_keys_var = tk.BooleanVar(value=True)
         self.vlookup_runs = []
         self.runs_count_var = tk.StringVar(value="Saved VLOOKUP steps: 0")
+        # <<ListboxSelect>> handler -> after() id of its coalesced run
+        self._pending_select = {}
         self._build_ui()
 
     def _build_ui(self):
         pad = {"padx": 6, "pady": 6}
         ttk.Label(
             self,
-            text=(
-                "How to use VLOOKUP:\n"
-                "1) Choose whether VLOOKUP should use the normal sheet output or generated pivot result.\n"
-                "2) Choose a lookup file. Its columns will appear below.\n"
-                "3) Pick the main key, lookup key, and lookup value column(s).\n"
-                "4) Click Run VLOOKUP. Preview updates automatically."
-            ),
+            text=_HELP_TEXT,
             wraplength=820,
             justify="left"
         ).pack(anchor="w", **pad)
@@ -44,7 +54,7 @@ class VlookupFrame(ttk.Frame):
         ttk.Label(form, text="1. Main key(s) from current file").grid(row=0, column=0, sticky="w", padx=6, pady=4)
         self.main_keys_lb = tk.Listbox(form, selectmode="multiple", height=7, exportselection=False)
         self.main_keys_lb.grid(row=1, column=0, sticky="nsew", padx=6, pady=4)
-        self.main_keys_lb.bind("<<ListboxSelect>>", lambda _event: self._on_main_keys_changed())
+        self.main_keys_lb.bind("<<ListboxSelect>>", lambda _event: self._schedule_select(self._on_main_keys_changed))
 
         ttk.Label(form, text="2. Lookup key(s) from lookup file").grid(row=0, column=1, sticky="w", padx=6, pady=4)
         lookup_key_panel = ttk.Frame(form)
@@ -55,12 +65,11 @@ class VlookupFrame(ttk.Frame):
             lookup_key_panel,
             text="Lookup keys have the same names as main keys",
             variable=self.same_keys_var,
-            command=self._toggle_lookup_keys
         ).grid(row=0, column=0, sticky="w", pady=(0, 4))
 
         self.lookup_keys_lb = tk.Listbox(lookup_key_panel, selectmode="multiple", height=4, exportselection=False)
         self.lookup_keys_lb.grid(row=1, column=0, sticky="nsew")
-        self.lookup_keys_lb.bind("<<ListboxSelect>>", lambda _event: self._sync_lookup_key_var())
+        self.lookup_keys_lb.bind("<<ListboxSelect>>", lambda _event: self._schedule_select(self._sync_lookup_key_var))
 
         ttk.Label(lookup_key_panel, text="Manual lookup key(s), comma-separated").grid(row=2, column=0, sticky="w", pady=(6, 0))
         self.lookup_keys_entry = ttk.Entry(lookup_key_panel, textvariable=self.lookup_keys_var, width=34)
@@ -69,7 +78,7 @@ class VlookupFrame(ttk.Frame):
         ttk.Label(form, text="3. Column(s) to bring from lookup file").grid(row=0, column=2, sticky="w", padx=6, pady=4)
         self.values_lb = tk.Listbox(form, selectmode="multiple", height=7, exportselection=False)
         self.values_lb.grid(row=1, column=2, sticky="nsew", padx=6, pady=4)
-        self.values_lb.bind("<<ListboxSelect>>", lambda _event: self._sync_values_var())
+        self.values_lb.bind("<<ListboxSelect>>", lambda _event: self._schedule_select(self._sync_values_var))
 
         options = ttk.Frame(form)
         options.grid(row=2, column=0, columnspan=3, sticky="ew", padx=6, pady=(6, 4))
@@ -117,9 +126,41 @@ class VlookupFrame(ttk.Frame):
         saved_box.pack(fill="x", padx=6, pady=(0, 6))
         self.runs_lb = tk.Listbox(saved_box, height=3, exportselection=False)
         self.runs_lb.pack(fill="x", padx=6, pady=6)
+        # every write (checkbox click, load_config, key auto-match) re-applies the state
+        self.same_keys_var.trace_add("write", lambda *_: self._toggle_lookup_keys())
         self._toggle_lookup_keys()
 
 
+    # click-dragging across a multiple-select listbox fires one <<ListboxSelect>>
+    # per row crossed; re-sync the vars and the other listboxes once it settles
+    SELECT_DEBOUNCE_MS = 50
+
+    def _schedule_select(self, handler):
+        name = handler.__name__
+        pending = self._pending_select.pop(name, None)
+        if pending is not None:
+            self.after_cancel(pending)
+        self._pending_select[name] = self.after(self.SELECT_DEBOUNCE_MS, self._run_select, name, handler)
+
+    def _run_select(self, name, handler):
+        self._pending_select.pop(name, None)
+        handler()
+
+    def _flush_pending_select(self):
+        """Run any debounced selection handler now, so reads see the settled state."""
+        for name, pending in list(self._pending_select.items()):
+            self.after_cancel(pending)
+            self._run_select(name, getattr(self, name))
+
+    def _cancel_pending_select(self):
+        for pending in self._pending_select.values():
+            self.after_cancel(pending)
+        self._pending_select.clear()
+
+    def destroy(self):
+        self._cancel_pending_select()
+        super().destroy()
+
     def use_pivot_result_input(self):
         """Switch VLOOKUP to use the generated pivot output as its main table."""
         self.input_mode_var.set("pivot_result")
@@ -133,6 +174,7 @@ class VlookupFrame(ttk.Frame):
             self.on_vlookup()
 
     def get_config(self):
+        self._flush_pending_select()
         main_keys = self._selected(self.main_keys_lb) or self._csv_to_list(self.main_keys_var.get())
         selected_lookup_keys = self._selected(self.lookup_keys_lb)
         manual_lookup_keys = self.lookup_keys_var.get().strip()
@@ -159,6 +201,7 @@ class VlookupFrame(ttk.Frame):
         return current
 
     def load_config(self, cfg: dict):
+        self._cancel_pending_select()  # the loaded config replaces any half-made selection
         self.vlookup_runs = list(cfg.get("runs", []))
         if not self.vlookup_runs and self._has_vlookup_fields(cfg):
             self.vlookup_runs = [self._snapshot_from_config(cfg)]
@@ -177,7 +220,6 @@ class VlookupFrame(ttk.Frame):
         self.input_mode_var.set(display_cfg.get("input_mode", "base"))
         self.same_keys_var.set(display_cfg.get("lookup_keys", "") == "")
         self._apply_listbox_selections()
-        self._toggle_lookup_keys()
 
     def save_current_step(self):
         self.add_run_config(self.get_config())
@@ -245,40 +287,71 @@ class VlookupFrame(ttk.Frame):
         self._auto_match_lookup_key()
         self._apply_listbox_selections()
         self._remove_lookup_keys_from_values()
-        self._toggle_lookup_keys()
 
     def _refresh_listbox(self, listbox, values):
+        # a disabled Tk listbox ignores delete/insert, so lift it for the refill
+        disabled = str(listbox.cget("state")) == "disabled"
+        if disabled:
+            listbox.configure(state="normal")
         listbox.delete(0, "end")
-        for item in values:
-            listbox.insert("end", item)
+        if values:
+            # one Tcl insert for the whole list instead of one per column
+            listbox.insert("end", *values)
+        if disabled:
+            listbox.configure(state="disabled")
+        self._listbox_items[str(listbox)] = list(values)
+        positions = {}
+        for i, item in enumerate(values):
+            positions.setdefault(str(item).strip().lower(), []).append(i)
+        self._listbox_positions[str(listbox)] = positions
 
     def _apply_listbox_selections(self):
-        main_keys = [c.strip() for c in self.main_keys_var.get().split(",") if c.strip()]
-        lookup_keys = [c.strip() for c in self.lookup_keys_var.get().split(",") if c.strip()]
-        values = [c.strip() for c in self.values_var.get().split(",") if c.strip()]
+        main_keys = split_csv(self.main_keys_var.get())
+        lookup_keys = split_csv(self.lookup_keys_var.get())
+        values = split_csv(self.values_var.get())
         self._select_values(self.main_keys_lb, main_keys)
         self._select_values(self.lookup_keys_lb, lookup_keys)
         self._select_values(self.values_lb, values)
 
     def _selected(self, listbox):
-        return [listbox.get(i) for i in listbox.curselection()]
+        sel = listbox.curselection()
+        items = self._listbox_items.get(str(listbox))
+        if items is None or (sel and sel[-1] >= len(items)):
+            return [listbox.get(i) for i in sel]
+        # _refresh_listbox filled it from items: index them instead of a get() per row
+        return [str(items[i]) for i in sel]
 
     def _csv_to_list(self, text):
-        return [c.strip() for c in str(text or "").split(",") if c.strip()]
+        return list(split_csv(str(text or "")))
 
     def _select_values(self, listbox, values):
         listbox.selection_clear(0, "end")
         value_lookup = {v.strip().lower() for v in values}
-        for i in range(listbox.size()):
-            if str(listbox.get(i)).strip().lower() in value_lookup:
-                listbox.selection_set(i)
+        if not value_lookup:
+            return
+        positions = self._listbox_positions.get(str(listbox))
+        if positions is not None:
+            hits = sorted(i for v in value_lookup for i in positions.get(v, ()))
+        else:
+            items = listbox.get(0, "end")  # not filled by _refresh_listbox: one bulk read
+            hits = [i for i, item in enumerate(items) if str(item).strip().lower() in value_lookup]
+        # select runs of adjacent matches with one selection_set(first, last) each
+        start = prev = None
+        for i in hits:
+            if start is None:
+                start = i
+            elif i != prev + 1:
+                listbox.selection_set(start, prev)
+                start = i
+            prev = i
+        if start is not None:
+            listbox.selection_set(start, prev)
 
     def _on_main_keys_changed(self):
         self.main_keys_var.set(", ".join(self._selected(self.main_keys_lb)))
         self._auto_match_lookup_key()
         self._apply_listbox_selections()
         self._remove_lookup_keys_from_values()
-        self._toggle_lookup_keys()
 
     def _sync_lookup_key_var(self):
         selected = self._selected(self.lookup_keys_lb)
@@ -296,7 +369,7 @@ class VlookupFrame(ttk.Frame):
             return
         selected_main_keys = self._selected(self.main_keys_lb)
         if not selected_main_keys:
-            selected_main_keys = [c.strip() for c in self.main_keys_var.get().split(",") if c.strip()]
+            selected_main_keys = list(split_csv(self.main_keys_var.get()))
         if not selected_main_keys:
             return
 
@@ -322,7 +395,7 @@ class VlookupFrame(ttk.Frame):
                 key_names = selected_lookup_keys
             else:
                 text = lookup_keys_text or self.lookup_keys_var.get()
-                key_names = [c.strip() for c in text.split(",") if c.strip()]
+                key_names = split_csv(text)
         return {str(c).strip().lower() for c in key_names}
 
     def _remove_lookup_keys_from_values(self):
@@ -8,38 +8,75 @@ Usage:
 - Returns the merged DataFrame (or None on cancel or error).
 """
 
+import hashlib
+import os
+import weakref
+
+import numpy as np
 import pandas as pd
 from tkinter import filedialog, simpledialog, messagebox
 
+from utils import read_excel_fast, split_csv
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv  # multithreaded CSV reader with column projection
+except ImportError:
+    pa = pa_csv = None
+
+
+# (abspath, mtime_ns, size) -> every column of that lookup file, most recently used last
+_LOOKUP_FILE_CACHE: dict = {}
+LOOKUP_FILE_CACHE_SIZE = 4
+
+# parsed copies of large lookup files, so a fresh session skips the CSV/XLSX parse
+LOOKUP_PARQUET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lookup_cache")
+LOOKUP_PARQUET_MIN_BYTES = 8 * 1024 * 1024  # smaller files parse about as fast as a Parquet read
+
+# (id(lookup_df), key columns, value columns) -> (weakref to lookup_df, indexed frame)
+_LOOKUP_INDEX_CACHE: dict = {}
+LOOKUP_INDEX_CACHE_SIZE = 4
+
 
 def _dedupe_keep_order(items):
-    seen = set()
-    out = []
-    for item in items:
-        if item in seen:
-            continue
-        seen.add(item)
-        out.append(item)
-    return out
+    return list(dict.fromkeys(items))
+
+
+def _column_names(df: pd.DataFrame) -> list[str]:
+    """Column labels as str; plain text headers are listed without an astype copy."""
+    cols = df.columns
+    return list(cols) if cols.inferred_type == "string" else list(cols.astype(str))
+
+
+def _resolve_names(names, col_map: dict) -> tuple[list, str | None]:
+    """Map user-typed names to real columns by their stripped, lowercased form;
+    returns (resolved columns, first name with no match or None)."""
+    resolved = [col_map.get(name.strip().lower()) for name in names]
+    for name, col in zip(names, resolved):
+        if not col:
+            return resolved, name
+    return resolved, None
 
 
 def _find_duplicate_columns(df: pd.DataFrame):
-    cols = [str(c) for c in df.columns]
-    seen = set()
-    dupes = []
-    for col in cols:
-        if col in seen and col not in dupes:
-            dupes.append(col)
-        seen.add(col)
-    return dupes
+    if df.columns.is_unique and df.columns.inferred_type == "string":
+        return []  # the usual case: str() cannot merge distinct text labels
+    cols = pd.Index([str(c) for c in df.columns], dtype=object)
+    return list(dict.fromkeys(cols[cols.duplicated()]))
 
 
 
-def _normalize_key_series(s: pd.Series) -> pd.Series:
-    """Normalize VLOOKUP keys so Excel/CSV type differences still match."""
-    if pd.api.types.is_datetime64_any_dtype(s):
-        return pd.to_datetime(s, errors="coerce").dt.strftime("%Y-%m-%d").fillna("")
+def _weighted_share(flags: pd.Series, weights: pd.Series | None) -> float:
+    """flags.mean() (NaN skipped), with each entry counted weights[i] times."""
+    if weights is None:
+        return flags.mean()
+    valid = flags.notna()
+    w = weights[flags.index][valid]
+    total = w.sum()
+    return w[flags[valid].astype(bool)].sum() / total if total else np.nan
 
+
+def _normalize_text_keys(s: pd.Series, weights: pd.Series | None = None) -> pd.Series:
     text = (
         s.astype(str)
         .str.replace("\u00a0", " ", regex=False)
@@ -49,24 +86,227 @@ def _normalize_key_series(s: pd.Series) -> pd.Series:
     text = text.replace({"nan": "", "nat": "", "none": ""})
 
     non_empty = text[text != ""]
-    if not non_empty.empty and non_empty.str.contains(r"[/-]", regex=True).mean() >= 0.6:
+    if not non_empty.empty and _weighted_share(non_empty.str.contains(r"[/-]", regex=True), weights) >= 0.6:
         parsed_dates = pd.to_datetime(text, errors="coerce", dayfirst=True)
-        if parsed_dates.notna().mean() >= 0.6:
+        if _weighted_share(parsed_dates.notna(), weights) >= 0.6:
             return parsed_dates.dt.strftime("%Y-%m-%d").fillna("")
 
     return text.str.casefold()
 
 
-def _read_lookup_file(app, lookup_path: str) -> pd.DataFrame:
+def _normalize_key_series(s: pd.Series) -> pd.Series:
+    """Normalize VLOOKUP keys so Excel/CSV type differences still match."""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return pd.to_datetime(s, errors="coerce").dt.strftime("%Y-%m-%d").fillna("")
+
+    # Text keys repeat (client codes, regions...): encode them as integer codes,
+    # normalize each distinct key once and expand back by code. Kept to pure str
+    # columns, where equal values always normalize alike (unlike 1 / True / 1.0).
+    is_text = pd.api.types.is_string_dtype(s) and (
+        s.dtype != object or pd.api.types.infer_dtype(s, skipna=False) == "string"
+    )
+    if is_text:
+        codes, uniques = pd.factorize(s, use_na_sentinel=False)
+        if len(uniques) < len(s):
+            counts = pd.Series(np.bincount(codes, minlength=len(uniques)))
+            normalized = _normalize_text_keys(pd.Series(uniques, name=s.name), counts)
+            return normalized.take(codes).set_axis(s.index)
+
+    return _normalize_text_keys(s)
+
+
+def _key_index(df: pd.DataFrame, cols: list) -> pd.Index:
+    keys = [_normalize_key_series(df[c]) for c in cols]
+    return pd.Index(keys[0]) if len(keys) == 1 else pd.MultiIndex.from_arrays(keys)
+
+
+def _indexed_lookup(lookup_df: pd.DataFrame, right_on: list, value_cols: list) -> pd.DataFrame:
+    """
+    lookup_df[value_cols] indexed by the normalized right_on keys, first hit per
+    key (Excel VLOOKUP semantics). Cached per lookup frame and column choice, so
+    repeated runs against the same lookup file skip key normalization and
+    de-duplication.
+    """
+    key = (id(lookup_df), tuple(right_on), tuple(value_cols))
+    hit = _LOOKUP_INDEX_CACHE.get(key)
+    if hit is not None and hit[0]() is lookup_df:
+        return hit[1]
+    indexed = lookup_df.loc[:, value_cols].set_axis(_key_index(lookup_df, right_on), axis=0)
+    indexed = indexed[~indexed.index.duplicated(keep="first")]
+    if len(_LOOKUP_INDEX_CACHE) >= LOOKUP_INDEX_CACHE_SIZE:
+        _LOOKUP_INDEX_CACHE.pop(next(iter(_LOOKUP_INDEX_CACHE)))
+    _LOOKUP_INDEX_CACHE[key] = (weakref.ref(lookup_df), indexed)
+    return indexed
+
+
+def _join_lookup(main_df, lookup_df, left_on, right_on, value_cols, added_cols, default_fill):
+    """
+    main_df with lookup_df[value_cols] attached as added_cols, matched on the
+    normalized keys. Pure pandas (no Tk), so it may run on a worker thread.
+    Returns (merged frame, number of lookup rows dropped as repeated keys).
+    """
+    # Excel VLOOKUP uses the first lookup hit, so the indexed lookup holds one
+    # row per key and a hash reindex replaces the merge (rows never multiply).
+    indexed = _indexed_lookup(lookup_df, right_on, value_cols)
+    fetched = indexed.reindex(_key_index(main_df, left_on)).reset_index(drop=True)
+    if default_fill is not None:
+        # only the fetched columns can hold misses: one fillna over them all
+        fetched = fetched.fillna(default_fill)
+    merged = pd.concat(
+        [main_df.reset_index(drop=True), fetched.set_axis(added_cols, axis=1)],
+        axis=1,
+    )
+    return merged, len(lookup_df) - len(indexed)
+
+
+def _lookup_usecols(preset: dict):
+    """
+    usecols callable keeping only the lookup key and value columns a preset
+    names (matched like perform_vlookup does: stripped, case-insensitive), or
+    None when the preset leaves them to be asked for and every column is needed.
+    """
+    keys = split_csv(preset.get("lookup_keys", "") or "") or split_csv(preset.get("main_keys", "") or "")
+    values = split_csv(preset.get("values", "") or "")
+    if not keys or not values:
+        return None
+    wanted = {c.lower() for c in keys + values}
+    return lambda col: str(col).strip().lower() in wanted
+
+
+def _read_csv_projected(lookup_path: str, usecols) -> pd.DataFrame:
+    """
+    Read only the usecols-selected columns of a UTF-8 CSV with pyarrow. Raises
+    on anything it cannot parse; callers fall back to the pandas readers.
+    """
+    with open(lookup_path, "r", encoding="utf-8-sig") as handle:
+        header = handle.readline()
+    sep = max((",", ";", "\t", "|"), key=header.count)
+    names = pd.read_csv(lookup_path, sep=sep, nrows=0, encoding="utf-8-sig").columns
+    keep = [c for c in names if usecols(c)]
+    if not keep:
+        raise ValueError("no lookup columns selected")
+    parse = pa_csv.ParseOptions(delimiter=sep)
+    convert = pa_csv.ConvertOptions(include_columns=keep, strings_can_be_null=True)
+    # Arrow turns ISO date/time text into temporal columns where pandas keeps the
+    # text: infer the schema from the first block, then read those as strings.
+    with pa_csv.open_csv(lookup_path, parse_options=parse, convert_options=convert) as reader:
+        temporal = [
+            f.name for f in reader.schema
+            if pa.types.is_temporal(f.type)
+        ]
+    if temporal:
+        convert = pa_csv.ConvertOptions(
+            include_columns=keep,
+            strings_can_be_null=True,
+            column_types={c: pa.string() for c in temporal},
+        )
+    return pa_csv.read_csv(lookup_path, parse_options=parse, convert_options=convert).to_pandas()
+
+
+def _read_lookup_file(app, lookup_path: str, usecols=None) -> pd.DataFrame:
+    if lookup_path.lower().endswith(".csv") and usecols is not None and pa_csv is not None:
+        try:
+            return _read_csv_projected(lookup_path, usecols)
+        except Exception:
+            pass  # not UTF-8 / irregular rows: the sniffing pandas readers below cope
     if lookup_path.lower().endswith(".csv") and hasattr(app, "_read_csv_safely"):
-        return app._read_csv_safely(lookup_path)
+        # delimiter/encoding sniffing reads whole rows; projection happens after
+        df = app._read_csv_safely(lookup_path)
+        return df if usecols is None else df.loc[:, [c for c in df.columns if usecols(c)]]
     if lookup_path.lower().endswith(".csv"):
-        return pd.read_csv(lookup_path)
-    return pd.read_excel(lookup_path)
+        return pd.read_csv(lookup_path, usecols=usecols)
+    return read_excel_fast(lookup_path, usecols=usecols)
+
+
+def _lookup_file_key(lookup_path: str) -> tuple:
+    st = os.stat(lookup_path)
+    return (os.path.abspath(lookup_path), st.st_mtime_ns, st.st_size)
+
+
+def _parquet_sidecar(key: tuple) -> tuple[str, str]:
+    """(sidecar path for this file version, name prefix shared by all its versions)."""
+    path, mtime_ns, size = key
+    stem = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(LOOKUP_PARQUET_DIR, f"{stem}-{mtime_ns}-{size}.parquet"), f"{stem}-"
+
 
+def _read_parquet_sidecar(key: tuple) -> pd.DataFrame | None:
+    if pa is None or key[2] < LOOKUP_PARQUET_MIN_BYTES:
+        return None
+    sidecar, _ = _parquet_sidecar(key)
+    try:
+        return pd.read_parquet(sidecar)
+    except Exception:
+        return None  # missing or unreadable: parse the source instead
+
+
+def _write_parquet_sidecar(key: tuple, df: pd.DataFrame) -> None:
+    if pa is None or key[2] < LOOKUP_PARQUET_MIN_BYTES:
+        return
+    if not (df.columns.is_unique and df.columns.inferred_type == "string"):
+        return  # Parquet needs unique text headers
+    sidecar, prefix = _parquet_sidecar(key)
+    tmp = sidecar + ".tmp"
+    try:
+        os.makedirs(LOOKUP_PARQUET_DIR, exist_ok=True)
+        df.to_parquet(tmp, compression="zstd")
+        os.replace(tmp, sidecar)
+    except Exception:
+        # e.g. a mixed-type object column Arrow cannot store: just keep parsing it
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return
+    with os.scandir(LOOKUP_PARQUET_DIR) as it:
+        stale = [e.path for e in it if e.name.startswith(prefix) and e.path != sidecar]
+    for old in stale:  # earlier versions of the same lookup file
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+def clear_lookup_cache() -> None:
+    """Drop every cached lookup file and index, including the Parquet copies."""
+    _LOOKUP_FILE_CACHE.clear()
+    _LOOKUP_INDEX_CACHE.clear()
+    if not os.path.isdir(LOOKUP_PARQUET_DIR):
+        return
+    with os.scandir(LOOKUP_PARQUET_DIR) as it:
+        sidecars = [e.path for e in it if e.name.endswith(".parquet")]
+    for path in sidecars:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # locked or already gone; its key can never match a newer file
 
-def _ask_choice(prompt: str, options: list[str], parent=None) -> str | None:
-    """Simple helper that asks user for a string; validates it is in options."""
+
+def load_lookup_file(app, lookup_path: str) -> pd.DataFrame:
+    """
+    Read a whole lookup file, reusing the parsed frame while the file is
+    unchanged (same path, mtime and size). Back-to-back VLOOKUP steps against
+    one workbook parse it once, and hand the same frame to _indexed_lookup.
+    Large files also get a Parquet copy in LOOKUP_PARQUET_DIR, read instead of
+    the source in later sessions. Callers treat the returned frame as read-only.
+    """
+    key = _lookup_file_key(lookup_path)
+    path = key[0]
+    df = _LOOKUP_FILE_CACHE.pop(key, None)
+    if df is None:
+        df = _read_parquet_sidecar(key)
+        if df is None:
+            df = _read_lookup_file(app, lookup_path)
+            _write_parquet_sidecar(key, df)
+        for stale in [k for k in _LOOKUP_FILE_CACHE if k[0] == path]:
+            del _LOOKUP_FILE_CACHE[stale]  # an older version of this file
+        while len(_LOOKUP_FILE_CACHE) >= LOOKUP_FILE_CACHE_SIZE:
+            _LOOKUP_FILE_CACHE.pop(next(iter(_LOOKUP_FILE_CACHE)))
+    _LOOKUP_FILE_CACHE[key] = df
+    return df
+
+
+def _ask_choice(prompt: str, options: list[str], parent=None, option_set: frozenset | None = None) -> str | None:
+    """Simple helper that asks user for a string; validates it is in options
+    (option_set: the same names as a set, when the caller already built it)."""
     if not options:
         messagebox.showerror("VLOOKUP", "No columns available for selection.")
         return None
@@ -75,7 +315,7 @@ def _ask_choice(prompt: str, options: list[str], parent=None) -> str | None:
     if val is None:
         return None
     val = val.strip()
-    if val not in options:
+    if val not in (option_set if option_set is not None else frozenset(options)):
         messagebox.showerror("VLOOKUP", f"'{val}' is not a valid option.")
         return None
     return val
@@ -110,20 +350,21 @@ def perform_vlookup(
     # steps chain together without mutating the raw loaded file.
     # base: filters/sorts/calculated columns only (normal VLOOKUP before pivot).
     # pivot_result: generated pivot output first, then VLOOKUP onto that result.
+    # No copies: main_df is only read here, and the result is a new frame (concat).
     try:
         if main_df_override is not None:
-            main_df = main_df_override.copy()
+            main_df = main_df_override
         elif input_mode == "pivot_result":
             if sheet.get("final_output_df") is not None:
-                main_df = sheet["final_output_df"].copy()
+                main_df = sheet["final_output_df"]
             elif hasattr(app, "_generate_filtered_df"):
                 main_df = app._generate_filtered_df(sheet)
             elif sheet.get("vlookup_base_df") is not None:
-                main_df = sheet["vlookup_base_df"].copy()
+                main_df = sheet["vlookup_base_df"]
             else:
                 main_df = app._generate_base_df(sheet)
         elif sheet.get("vlookup_base_df") is not None:
-            main_df = sheet["vlookup_base_df"].copy()
+            main_df = sheet["vlookup_base_df"]
         elif hasattr(app, "_generate_base_df"):
             main_df = app._generate_base_df(sheet)
         else:
@@ -150,7 +391,15 @@ def perform_vlookup(
 
         # Load lookup DataFrame
         try:
-            lookup_df = _read_lookup_file(app, lookup_path)
+            # a fresh cached parse beats any re-read; otherwise a projected read
+            # (not kept) loads only the columns the preset names
+            usecols = _lookup_usecols(preset)
+            if usecols is None:
+                lookup_df = load_lookup_file(app, lookup_path)
+            else:
+                lookup_df = _LOOKUP_FILE_CACHE.get(_lookup_file_key(lookup_path))
+                if lookup_df is None:
+                    lookup_df = _read_lookup_file(app, lookup_path, usecols=usecols)
         except Exception as e:
             messagebox.showerror("VLOOKUP", f"Failed to load lookup file:\n{e}")
             return None
@@ -160,16 +409,18 @@ def perform_vlookup(
         return None
 
     # Columns lists
-    main_cols = list(main_df.columns.astype(str))
-    lookup_cols = list(lookup_df.columns.astype(str))
+    main_cols = _column_names(main_df)
+    lookup_cols = _column_names(lookup_df)
     main_col_map = {c.strip().lower(): c for c in main_cols}
     lookup_col_map = {c.strip().lower(): c for c in lookup_cols}
+    main_set = frozenset(main_cols)
+    lookup_set = frozenset(lookup_cols)
 
     if preset.get("main_keys"):
-        keys_main = [c.strip() for c in preset.get("main_keys", "").split(",") if c.strip()]
+        keys_main = list(split_csv(preset.get("main_keys", "")))
         raw_lookup = preset.get("lookup_keys", "").strip()
         if raw_lookup:
-            keys_lookup = [c.strip() for c in raw_lookup.split(",") if c.strip()]
+            keys_lookup = list(split_csv(raw_lookup))
         else:
             keys_lookup = list(keys_main)
     else:
@@ -177,10 +428,14 @@ def perform_vlookup(
         keys_lookup = []
 
     if not keys_main or not keys_lookup:
-        key_main = _ask_choice("Enter key column in main sheet (exact name):", main_cols, parent=app)
+        key_main = _ask_choice(
+            "Enter key column in main sheet (exact name):", main_cols, parent=app, option_set=main_set
+        )
         if not key_main:
             return None
-        key_lookup = _ask_choice("Enter key column in lookup file (exact name):", lookup_cols, parent=app)
+        key_lookup = _ask_choice(
+            "Enter key column in lookup file (exact name):", lookup_cols, parent=app, option_set=lookup_set
+        )
         if not key_lookup:
             return None
 
@@ -188,7 +443,7 @@ def perform_vlookup(
         keys_lookup = [key_lookup]
 
     if preset.get("values"):
-        val_cols = [c.strip() for c in preset.get("values", "").split(",") if c.strip()]
+        val_cols = list(split_csv(preset.get("values", "")))
     else:
         val_cols = []
 
@@ -204,38 +459,29 @@ def perform_vlookup(
         )
         if not raw_vals:
             return None
-        val_cols = [c.strip() for c in raw_vals.split(",") if c.strip()]
+        val_cols = list(split_csv(raw_vals))
         missing_vals = [v for v in val_cols if v.strip().lower() not in lookup_col_map]
         if missing_vals:
             messagebox.showerror("VLOOKUP", f"Lookup value column(s) not found: {', '.join(missing_vals)}")
             return None
 
-    normalized_main_keys = []
-    for key in keys_main:
-        normalized = main_col_map.get(key.strip().lower())
-        if not normalized:
-            messagebox.showerror("VLOOKUP", f"Main key not found: {key}")
-            return None
-        normalized_main_keys.append(normalized)
-
-    normalized_lookup_keys = []
-    for key in keys_lookup:
-        normalized = lookup_col_map.get(key.strip().lower())
-        if not normalized:
-            messagebox.showerror(
-                "VLOOKUP",
-                f"Lookup key not found: {key}\nAvailable lookup columns: {', '.join(lookup_cols)}"
-            )
-            return None
-        normalized_lookup_keys.append(normalized)
+    normalized_main_keys, missing = _resolve_names(keys_main, main_col_map)
+    if missing is not None:
+        messagebox.showerror("VLOOKUP", f"Main key not found: {missing}")
+        return None
 
-    normalized_values = []
-    for col in val_cols:
-        normalized = lookup_col_map.get(col.strip().lower())
-        if not normalized:
-            messagebox.showerror("VLOOKUP", f"Lookup value column not found: {col}")
-            return None
-        normalized_values.append(normalized)
+    normalized_lookup_keys, missing = _resolve_names(keys_lookup, lookup_col_map)
+    if missing is not None:
+        messagebox.showerror(
+            "VLOOKUP",
+            f"Lookup key not found: {missing}\nAvailable lookup columns: {', '.join(lookup_cols)}"
+        )
+        return None
+
+    normalized_values, missing = _resolve_names(val_cols, lookup_col_map)
+    if missing is not None:
+        messagebox.showerror("VLOOKUP", f"Lookup value column not found: {missing}")
+        return None
 
     if len(normalized_main_keys) != len(normalized_lookup_keys):
         messagebox.showerror("VLOOKUP", "Number of keys on both sides must match.")
@@ -256,7 +502,9 @@ def perform_vlookup(
     prefix = prefix.strip() if isinstance(prefix, str) else ""
     default_fill = default_fill if default_fill != "" else None
 
-    if not preset.get("prefix") and not preset.get("default_fill") and interactive:
+    # VlookupFrame configs always carry both fields (blank means "none"), so only a
+    # preset that lacks them entirely still walks the prefix/default-fill dialogs
+    if "prefix" not in preset and "default_fill" not in preset and interactive:
         # New column prefix / name handling: ask for a prefix to avoid collisions
         prefix = simpledialog.askstring("VLOOKUP", "Enter prefix for added columns (leave blank for none):", parent=app)
         if prefix is None:
@@ -276,26 +524,14 @@ def perform_vlookup(
 
         key_set = set(right_on)
         lookup_value_cols = _dedupe_keep_order([c for c in normalized_values if c not in key_set])
+        if not lookup_value_cols:
+            # every requested column is a join key: nothing to fetch, so no join
+            messagebox.showinfo("VLOOKUP", "VLOOKUP match complete — no value columns added (keys-only match).")
+            return main_df.reset_index(drop=True)
 
-        main_work = main_df.copy()
-        lookup_sub = lookup_df.loc[:, _dedupe_keep_order(right_on + lookup_value_cols)].copy()
-
-        left_tmp_keys = []
-        right_tmp_keys = []
-        for i, (left_col, right_col) in enumerate(zip(left_on, right_on)):
-            left_tmp = f"__excelops_vlookup_left_key_{i}__"
-            right_tmp = f"__excelops_vlookup_right_key_{i}__"
-            main_work[left_tmp] = _normalize_key_series(main_work[left_col])
-            lookup_sub[right_tmp] = _normalize_key_series(lookup_sub[right_col])
-            left_tmp_keys.append(left_tmp)
-            right_tmp_keys.append(right_tmp)
-
-        # Excel VLOOKUP uses the first lookup hit. Prevent duplicate lookup keys from multiplying rows.
-        lookup_sub = lookup_sub.drop_duplicates(subset=right_tmp_keys, keep="first")
-
+        # names for the fetched columns, in order: prefixed, then made unique
         added_cols = []
-        rename_map = {}
-        reserved = set(str(c) for c in main_work.columns)
+        reserved = set(map(str, main_df.columns))
         for col in lookup_value_cols:
             base_name = f"{prefix}{col}" if prefix else col
             new_name = base_name
@@ -304,32 +540,15 @@ def perform_vlookup(
                 new_name = f"{base_name}_lk{suffix_i}"
                 suffix_i += 1
             reserved.add(new_name)
-            rename_map[col] = new_name
             added_cols.append(new_name)
 
-        if rename_map:
-            lookup_sub.rename(columns=rename_map, inplace=True)
-
-        merge_cols = right_tmp_keys + added_cols
-        merged = main_work.merge(
-            lookup_sub.loc[:, merge_cols],
-            how="left",
-            left_on=left_tmp_keys,
-            right_on=right_tmp_keys,
-            suffixes=("", "_lk"),
-        )
-
-        merged.drop(columns=left_tmp_keys + right_tmp_keys, inplace=True, errors="ignore")
-
-        if default_fill is not None:
-            for col in added_cols:
-                if col in merged.columns:
-                    merged[col] = merged[col].fillna(default_fill)
+        # the hashing and copying can take seconds: off the Tk thread when the app can
+        run = getattr(app, "_run_responsive", None)
+        args = (main_df, lookup_df, left_on, right_on, lookup_value_cols, added_cols, default_fill)
+        merged, dup_rows = run("Running VLOOKUP…", _join_lookup, *args) if run else _join_lookup(*args)
 
-        if added_cols:
-            messagebox.showinfo("VLOOKUP", f"VLOOKUP merge complete — added: {', '.join(added_cols)}")
-        else:
-            messagebox.showinfo("VLOOKUP", "VLOOKUP match complete — no value columns added (keys-only match).")
+        dup_note = f"\n\n{dup_rows:,} lookup row(s) repeated a key; the first match was used." if dup_rows else ""
+        messagebox.showinfo("VLOOKUP", f"VLOOKUP merge complete — added: {', '.join(added_cols)}{dup_note}")
         return merged
 
     except Exception as e: